@@ -30,6 +30,7 @@ Bank-Specific Considerations
 
 import logging
 from dataclasses import dataclass
+from functools import cached_property
 
 import pandas as pd
 
@@ -528,6 +529,15 @@ BANK_LINE_ITEM_MAPPINGS: dict[str, LineItemMapping] = {
 }
 
 
+# Filing form preference when a tag is reported more than once (lower wins);
+# anything else (8-K, registration statements) ranks after these
+FORM_RANK = {"10-K": 0, "10-Q": 1, "10-K/A": 2, "10-Q/A": 3}
+_OTHER_FORM_RANK = 99
+
+# Taxonomy prefixes allowed in mapped tags ("namespace:Element")
+NAMESPACES = frozenset({"us-gaap", "dei", "srt"})
+
+
 # =============================================================================
 # NORMALIZER CLASS
 # =============================================================================
@@ -548,6 +558,19 @@ class XBRLNormalizer:
     >>> quarterly_df = normalizer.normalize(raw_facts_df)
     """
 
+    # Columns of normalize() output, also used for the empty result
+    OUTPUT_COLUMNS = (
+        "ticker",
+        "fiscal_year",
+        "fiscal_period",
+        "date",
+        "line_item",
+        "display_name",
+        "category",
+        "value",
+        "source_tag",
+    )
+
     def __init__(
         self,
         config: Config | None = None,
@@ -564,10 +587,17 @@ class XBRLNormalizer:
         self.config = config or DEFAULT_CONFIG
         self.mappings = mappings or BANK_LINE_ITEM_MAPPINGS
         self.min_year = min_year
+        self._tag_table = _build_tag_table(self.mappings)
+        # tag -> row of the tag table; only usable while every tag maps to one line item
+        self._tag_index = {tag: i for i, tag in enumerate(self._tag_table["tag"])}
 
     def normalize(self, raw_facts: pd.DataFrame) -> pd.DataFrame:
         """Normalize raw facts to standardized quarterly panel.
 
+        Facts are joined to the tag table once, then each (ticker, period, line item)
+        keeps its highest-priority tag with a non-null value. Within a tag, the
+        preferred form wins and ties go to the most recently dated fact.
+
         Args:
             raw_facts: DataFrame from fundamentals_raw_facts.parquet with columns:
                        date, cik, ticker, tag, value, unit, fp, fy, form
@@ -582,21 +612,58 @@ class XBRLNormalizer:
         df = raw_facts[
             (raw_facts["fy"] >= self.min_year)
             & (raw_facts["fp"].isin(["Q1", "Q2", "Q3", "Q4", "FY"]))
-        ].copy()
+        ]
 
         logger.info(f"After year/period filter: {len(df):,} facts")
 
-        results = []
-
-        for ticker in df["ticker"].unique():
-            ticker_df = df[df["ticker"] == ticker]
-            ticker_results = self._normalize_ticker(ticker_df, ticker)
-            results.append(ticker_results)
-
-        if not results:
-            return pd.DataFrame()
-
-        output = pd.concat(results, ignore_index=True)
+        # Nothing left to map or deduplicate
+        if df.empty:
+            return pd.DataFrame(columns=list(self.OUTPUT_COLUMNS))
+
+        period_keys = ["ticker", "fy", "fp"]
+        facts = df[[*period_keys, "date", "tag", "value", "unit", "form"]].assign(
+            # Period end date is the latest fact date across every tag in the period
+            period_date=df.groupby(period_keys, observed=True)["date"].transform("max")
+        )
+        facts = self._attach_mappings(facts)
+
+        # Unit filter only applies to USD and share counts
+        unit_ok = (facts["unit"] == facts["unit_filter"]) | ~facts["unit_filter"].isin(
+            ["USD", "shares"]
+        )
+        facts = facts[unit_ok]
+
+        # On a categorical form column map() only visits the categories; going via
+        # float keeps the fill valid whether map() returns numbers or categories
+        form_rank = (
+            facts["form"].map(FORM_RANK).astype("float64").fillna(_OTHER_FORM_RANK).astype("int8")
+        )
+        facts = facts.assign(form_rank=form_rank).sort_values(
+            [*period_keys, "line_item", "tag_priority", "form_rank", "date"],
+            ascending=[True, True, True, True, True, True, False],
+            kind="mergesort",
+        )
+
+        # One fact per tag, then the first tag (in priority order) that has a value
+        facts = facts.drop_duplicates([*period_keys, "line_item", "tag"])
+        facts = facts[facts["value"].notna()]
+        facts = facts.drop_duplicates([*period_keys, "line_item"])
+
+        output = pd.DataFrame(
+            {
+                # Categorical and Arrow string inputs are decoded so downstream
+                # pivots see plain labels
+                "ticker": facts["ticker"].astype(object),
+                "fiscal_year": facts["fy"].astype("int64"),
+                "fiscal_period": facts["fp"].astype(object),
+                "date": facts["period_date"],
+                "line_item": facts["line_item"],
+                "display_name": facts["display_name"],
+                "category": facts["category"],
+                "value": facts["value"].astype("float64"),
+                "source_tag": facts["tag"].astype(object),
+            }
+        )
         output = output.sort_values(
             ["ticker", "fiscal_year", "fiscal_period", "line_item"]
         ).reset_index(drop=True)
@@ -604,93 +671,18 @@ class XBRLNormalizer:
         logger.info(f"Normalized to {len(output):,} line items")
         return output
 
-    def _normalize_ticker(self, ticker_df: pd.DataFrame, ticker: str) -> pd.DataFrame:
-        """Normalize facts for a single ticker."""
-        results = []
-
-        # Get unique fiscal periods
-        periods = ticker_df.groupby(["fy", "fp"]).size().reset_index()[["fy", "fp"]]
-
-        for _, period_row in periods.iterrows():
-            fy = period_row["fy"]
-            fp = period_row["fp"]
-
-            period_df = ticker_df[(ticker_df["fy"] == fy) & (ticker_df["fp"] == fp)]
+    def _attach_mappings(self, facts: pd.DataFrame) -> pd.DataFrame:
+        """Drop unmapped facts and add the tag table columns to the rest."""
+        if len(self._tag_index) < len(self._tag_table):
+            # A tag shared by several line items needs a real join
+            return facts.merge(self._tag_table, on="tag", how="inner")
 
-            for item_name, mapping in self.mappings.items():
-                value, source_tag = self._extract_line_item(period_df, mapping)
-
-                if value is not None:
-                    # Get the period end date
-                    period_date = period_df["date"].max()
-
-                    results.append(
-                        {
-                            "ticker": ticker,
-                            "fiscal_year": int(fy),
-                            "fiscal_period": fp,
-                            "date": period_date,
-                            "line_item": item_name,
-                            "display_name": mapping.display_name,
-                            "category": mapping.category,
-                            "value": value,
-                            "source_tag": source_tag,
-                        }
-                    )
-
-        return pd.DataFrame(results)
-
-    def _extract_line_item(
-        self,
-        period_df: pd.DataFrame,
-        mapping: LineItemMapping,
-    ) -> tuple[float | None, str | None]:
-        """Extract a single line item value from period facts.
-
-        Args:
-            period_df: Facts for a single fiscal period
-            mapping: Line item mapping definition
-
-        Returns:
-            Tuple of (value, source_tag) or (None, None) if not found
-        """
-        # Filter by unit
-        if mapping.unit_filter == "USD":
-            unit_df = period_df[period_df["unit"] == "USD"]
-        elif mapping.unit_filter == "shares":
-            unit_df = period_df[period_df["unit"] == "shares"]
-        else:
-            unit_df = period_df
-
-        # Try each tag in priority order
-        for tag in mapping.tags:
-            tag_df = unit_df[unit_df["tag"] == tag]
-
-            if len(tag_df) == 0:
-                continue
-
-            # Deduplicate: prefer 10-K/10-Q, then most recent
-            if len(tag_df) > 1:
-                # Prefer quarterly/annual filings
-                preferred_forms = ["10-K", "10-Q", "10-K/A", "10-Q/A"]
-                for form in preferred_forms:
-                    form_df = tag_df[tag_df["form"] == form]
-                    if len(form_df) > 0:
-                        tag_df = form_df
-                        break
-
-                # Take most recent by date
-                tag_df = tag_df.sort_values("date", ascending=False).head(1)
-
-            value = tag_df["value"].iloc[0]
-
-            # Validate value
-            if pd.isna(value):
-                continue
-
-            return float(value), tag
-
-        return None, None
+        rows = facts["tag"].map(self._tag_index)
+        mapped = rows.notna()
+        meta = self._tag_table.iloc[rows[mapped].to_numpy(dtype="int64")]
+        return facts[mapped].assign(
+            **{col: meta[col].to_numpy() for col in self._tag_table.columns if col != "tag"}
+        )
 
     def to_wide_format(self, normalized_df: pd.DataFrame) -> pd.DataFrame:
         """Convert normalized long format to wide format.
@@ -718,9 +710,16 @@ class XBRLNormalizer:
     def get_data_dictionary(self) -> pd.DataFrame:
         """Generate data dictionary for line item mappings.
 
+        Built once per normalizer (mappings don't change after init); every call
+        returns the same frame, so copy it before modifying.
+
         Returns:
             DataFrame documenting each line item
         """
+        return self._data_dictionary
+
+    @cached_property
+    def _data_dictionary(self) -> pd.DataFrame:
         records = []
         for name, mapping in self.mappings.items():
             records.append(
@@ -759,3 +758,43 @@ def load_and_normalize(config: Config | None = None) -> pd.DataFrame:
     normalized = normalizer.normalize(raw_facts)
 
     return normalized
+
+
+def _build_tag_table(mappings: dict[str, LineItemMapping]) -> pd.DataFrame:
+    """Flatten line item mappings into one row per (line item, tag)."""
+    return pd.DataFrame(
+        [
+            {
+                "tag": tag,
+                "line_item": name,
+                "tag_priority": priority,
+                "unit_filter": mapping.unit_filter,
+                "display_name": mapping.display_name,
+                "category": mapping.category,
+            }
+            for name, mapping in mappings.items()
+            for priority, tag in enumerate(mapping.tags)
+        ],
+        columns=["tag", "line_item", "tag_priority", "unit_filter", "display_name", "category"],
+    )
+
+
+def _validate_mappings(mappings: dict[str, LineItemMapping]) -> None:
+    """Check every mapped tag is "namespace:Element" with a known namespace.
+
+    All tags are checked in one vectorized pass.
+
+    Raises:
+        ValueError: If any tag lacks a prefix or uses an unknown namespace
+    """
+    tags = pd.Series(
+        [tag for mapping in mappings.values() for tag in mapping.tags], dtype="string[pyarrow]"
+    )
+    namespaces = tags.str.split(":", n=1).str[0]
+    bad = ~tags.str.contains(":", regex=False) | ~namespaces.isin(NAMESPACES)
+    if bad.any():
+        raise ValueError(f"Invalid XBRL tags in mappings: {tags[bad].tolist()}")
+
+
+# The built-in mappings are validated once at import, not per normalizer
+_validate_mappings(BANK_LINE_ITEM_MAPPINGS)
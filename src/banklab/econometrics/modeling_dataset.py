@@ -7,6 +7,7 @@ import numpy as np
 import pandas as pd
 
 from banklab.config import DEFAULT_CONFIG, Config
+from banklab.io import read_parquet
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +25,10 @@ class ModelingDatasetBuilder:
 
     def load_kpis(self) -> pd.DataFrame:
         """Load and reshape KPIs to wide format."""
-        kpis = pd.read_parquet(self.processed_dir / "kpis_quarterly.parquet")
+        kpis = read_parquet(
+            self.processed_dir / "kpis_quarterly.parquet",
+            columns=["ticker", "fiscal_year", "fiscal_period", "date", "kpi_name", "value"],
+        )
 
         # Pivot to wide
         kpi_wide = kpis.pivot_table(
@@ -32,6 +36,7 @@ class ModelingDatasetBuilder:
             columns="kpi_name",
             values="value",
             aggfunc="first",
+            observed=True,
         ).reset_index()
 
         return kpi_wide
@@ -55,14 +60,16 @@ class ModelingDatasetBuilder:
         """Load quarterly market returns and betas."""
         from banklab.market.returns import compute_returns, returns_to_quarterly
 
-        prices = pd.read_parquet(self.processed_dir / "prices_daily.parquet")
+        prices = read_parquet(
+            self.processed_dir / "prices_daily.parquet", columns=["date", "ticker", "close"]
+        )
         daily_ret = compute_returns(prices)
         returns = returns_to_quarterly(daily_ret)
 
         # Load rolling betas if available
         beta_path = self.processed_dir / "rolling_betas.parquet"
         if beta_path.exists():
-            betas = pd.read_parquet(beta_path)
+            betas = read_parquet(beta_path, columns=["ticker", "date", "beta_mktrf", "r_squared"])
             # Get quarter-end betas
             betas["year"] = betas["date"].dt.year
             betas["quarter"] = betas["date"].dt.quarter
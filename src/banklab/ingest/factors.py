@@ -3,6 +3,7 @@
 import io
 import logging
 import zipfile
+from pathlib import Path
 
 import pandas as pd
 
@@ -36,20 +37,31 @@ class FactorsLoader:
 
     def download_factors(self, force_refresh: bool = False) -> pd.DataFrame:
         cache_key = "ff5_daily.zip"
+        cache_path = self.cache.get_cache_path(cache_key)
         if not force_refresh:
-            cached = self.cache.load_bytes(cache_key)
-            if cached:
+            # Downloads stream to the plain path; a zstd-compressed copy stored
+            # through CacheManager.store is decompressed into memory instead
+            cached = cache_path if cache_path.exists() else self.cache.load_bytes(cache_key)
+            if cached is not None:
                 logger.info("Loading cached Fama-French factors")
                 return self._parse_ff_zip(cached)
         logger.info("Downloading Fama-French 5-factor data")
-        zip_bytes = self.requester.get_bytes(FF_5_FACTORS_URL)
-        self.cache.store(
-            cache_key, zip_bytes, FF_5_FACTORS_URL, notes="Fama-French daily 5-factor model"
+        # Stream straight into the cache file; the digest comes from the stream
+        file_hash = self.requester.get_to_file(
+            FF_5_FACTORS_URL, cache_path, hash_algo=self.manifest.hash_algo
         )
-        return self._parse_ff_zip(zip_bytes)
+        self.manifest.record(
+            cache_key,
+            FF_5_FACTORS_URL,
+            cache_path,
+            notes="Fama-French daily 5-factor model",
+            file_hash=file_hash,
+        )
+        return self._parse_ff_zip(cache_path)
 
-    def _parse_ff_zip(self, zip_bytes: bytes) -> pd.DataFrame:
-        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
+    def _parse_ff_zip(self, source: bytes | Path) -> pd.DataFrame:
+        zip_source = io.BytesIO(source) if isinstance(source, bytes) else source
+        with zipfile.ZipFile(zip_source) as zf:
             # Find CSV file (case-insensitive)
             csv_files = [n for n in zf.namelist() if n.lower().endswith(".csv")]
             if not csv_files:
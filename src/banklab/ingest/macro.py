@@ -76,10 +76,10 @@ class MacroLoader:
 
         # Check cache
         if not force_refresh:
-            cached = self.cache.load_text(cache_key)
-            if cached:
+            cached = self.cache.load_json(cache_key)
+            if cached is not None:
                 logger.info(f"Loading cached FRED series {series_id}")
-                return self._parse_fred_json(json.loads(cached), series_id)
+                return self._parse_fred_json(cached, series_id)
 
         # Download fresh
         url = FRED_OBSERVATIONS_URL.format(
@@ -6,11 +6,15 @@ Handles:
 - XBRL company facts
 """
 
-import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Any
 
+import orjson
 import pandas as pd
+import pyarrow as pa
 
 from banklab.config import DEFAULT_CONFIG, Config
 from banklab.utils.cache import CacheManager, DataManifest
@@ -23,6 +27,15 @@ SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
 SEC_COMPANY_FACTS_URL = "https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
 
+# Low-cardinality fact columns stored as categoricals
+CATEGORY_COLUMNS = ["ticker", "form", "fp", "unit"]
+
+# Remaining string columns (tag, cik) stay in Arrow buffers instead of Python objects
+_ARROW_STRING_DTYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+}
+
 
 class SECLoader:
     """Load data from SEC EDGAR APIs.
@@ -48,6 +61,10 @@ class SECLoader:
 
         self._ticker_cik_map: dict[str, str] | None = None
 
+        # Per-instance memo: repeat lookups skip the map load and upper-casing.
+        # Unknown tickers raise, so they are never cached.
+        self.get_cik = lru_cache(maxsize=4096)(self._get_cik_uncached)
+
     def get_ticker_cik_map(self) -> dict[str, str]:
         """Get mapping of tickers to CIK numbers.
 
@@ -60,29 +77,22 @@ class SECLoader:
         cache_key = "company_tickers.json"
 
         # Try cache first
-        cached = self.cache.load_text(cache_key)
-        if cached:
-            data = json.loads(cached)
-        else:
+        data = self.cache.load_json(cache_key)
+        if data is None:
             # Download fresh
             logger.info("Downloading SEC ticker->CIK mapping")
-            data = self.requester.get_json(SEC_TICKERS_URL)
-            self.cache.store(
-                cache_key,
-                json.dumps(data),
-                SEC_TICKERS_URL,
-                notes="SEC ticker to CIK mapping",
-            )
-
-        # Parse into ticker -> CIK map (CIK zero-padded to 10 digits)
+            data = self._download_json(cache_key, SEC_TICKERS_URL, "SEC ticker to CIK mapping")
+
+        # Parse into ticker -> CIK map (CIK zero-padded to 10 digits). Keys are
+        # upper-cased once here so lookups are a single dict probe.
         self._ticker_cik_map = {
-            entry["ticker"]: str(entry["cik_str"]).zfill(10) for entry in data.values()
+            entry["ticker"].upper(): str(entry["cik_str"]).zfill(10) for entry in data.values()
         }
         logger.info(f"Loaded {len(self._ticker_cik_map)} ticker->CIK mappings")
         return self._ticker_cik_map
 
-    def get_cik(self, ticker: str) -> str:
-        """Get CIK for a ticker symbol.
+    def _get_cik_uncached(self, ticker: str) -> str:
+        """Get CIK for a ticker symbol (memoized per instance as ``get_cik``).
 
         Args:
             ticker: Stock ticker (e.g., 'JPM')
@@ -93,11 +103,10 @@ class SECLoader:
         Raises:
             ValueError: If ticker not found
         """
-        ticker_map = self.get_ticker_cik_map()
-        ticker_upper = ticker.upper()
-        if ticker_upper not in ticker_map:
-            raise ValueError(f"Ticker '{ticker}' not found in SEC database")
-        return ticker_map[ticker_upper]
+        try:
+            return self.get_ticker_cik_map()[ticker.upper()]
+        except KeyError:
+            raise ValueError(f"Ticker '{ticker}' not found in SEC database") from None
 
     def get_submissions(self, ticker: str) -> dict[str, Any]:
         """Get filing submissions metadata for a company.
@@ -111,21 +120,13 @@ class SECLoader:
         cik = self.get_cik(ticker)
         cache_key = f"submissions_{ticker}_{cik}.json"
 
-        cached = self.cache.load_text(cache_key)
-        if cached:
-            return json.loads(cached)
+        cached = self.cache.load_json(cache_key)
+        if cached is not None:
+            return cached
 
         url = SEC_SUBMISSIONS_URL.format(cik=cik)
         logger.info(f"Downloading submissions for {ticker} (CIK: {cik})")
-        data = self.requester.get_json(url)
-
-        self.cache.store(
-            cache_key,
-            json.dumps(data),
-            url,
-            notes=f"Filing submissions for {ticker}",
-        )
-        return data
+        return self._download_json(cache_key, url, f"Filing submissions for {ticker}")
 
     def get_company_facts(self, ticker: str) -> dict[str, Any]:
         """Get XBRL company facts for a company.
@@ -139,21 +140,37 @@ class SECLoader:
         cik = self.get_cik(ticker)
         cache_key = f"companyfacts_{ticker}_{cik}.json"
 
-        cached = self.cache.load_text(cache_key)
-        if cached:
-            return json.loads(cached)
+        cached = self.cache.load_json(cache_key)
+        if cached is not None:
+            return cached
 
         url = SEC_COMPANY_FACTS_URL.format(cik=cik)
         logger.info(f"Downloading company facts for {ticker} (CIK: {cik})")
-        data = self.requester.get_json(url)
+        return self._download_json(cache_key, url, f"XBRL company facts for {ticker}")
+
+    def prefetch_company_facts(self, tickers: list[str]) -> None:
+        """Download company facts for all uncached tickers concurrently.
 
-        self.cache.store(
-            cache_key,
-            json.dumps(data),
-            url,
-            notes=f"XBRL company facts for {ticker}",
+        Args:
+            tickers: Stock tickers
+        """
+        pending = []
+        for ticker in tickers:
+            cik = self.get_cik(ticker)
+            cache_key = f"companyfacts_{ticker}_{cik}.json"
+            if not self.cache.has_cached(cache_key):
+                pending.append((ticker, cache_key, SEC_COMPANY_FACTS_URL.format(cik=cik)))
+        if not pending:
+            return
+
+        logger.info(f"Downloading company facts for {len(pending)} tickers")
+        responses = self.requester.get_many([url for _, _, url in pending])
+        self.cache.store_many(
+            [
+                (cache_key, response.content, url, f"XBRL company facts for {ticker}")
+                for (ticker, cache_key, url), response in zip(pending, responses, strict=True)
+            ]
         )
-        return data
 
     def extract_facts_to_df(self, ticker: str) -> pd.DataFrame:
         """Extract company facts into a flat DataFrame.
@@ -164,37 +181,9 @@ class SECLoader:
         Returns:
             DataFrame with columns: date, cik, ticker, tag, value, unit, fp, fy, form
         """
-        facts_data = self.get_company_facts(ticker)
-        cik = self.get_cik(ticker)
-
-        rows = []
-
-        # Navigate the nested structure
-        # facts_data['facts'][taxonomy][tag]['units'][unit] = list of observations
-        for taxonomy, tags in facts_data.get("facts", {}).items():
-            for tag, tag_data in tags.items():
-                for unit, observations in tag_data.get("units", {}).items():
-                    for obs in observations:
-                        rows.append(
-                            {
-                                "date": obs.get("end") or obs.get("filed"),
-                                "cik": cik,
-                                "ticker": ticker.upper(),
-                                "tag": f"{taxonomy}:{tag}",
-                                "value": obs.get("val"),
-                                "unit": unit,
-                                "fp": obs.get("fp", ""),
-                                "fy": obs.get("fy"),
-                                "form": obs.get("form", ""),
-                            }
-                        )
-
-        df = pd.DataFrame(rows)
-        if not df.empty:
-            df["date"] = pd.to_datetime(df["date"], errors="coerce")
-            df = df.dropna(subset=["date"])
-            df = df.sort_values("date").reset_index(drop=True)
-
+        df = _parse_facts_json(
+            self.get_company_facts(ticker), ticker, self.get_cik(ticker)
+        ).to_pandas(types_mapper=_ARROW_STRING_DTYPES.get)
         logger.info(f"Extracted {len(df)} facts for {ticker}")
         return df
 
@@ -208,7 +197,98 @@ class SECLoader:
             Combined DataFrame of all company facts
         """
         tickers = tickers or self.config.tickers
-        dfs = [self.extract_facts_to_df(ticker) for ticker in tickers]
-        combined = pd.concat(dfs, ignore_index=True)
+        self.prefetch_company_facts(tickers)
+        if len(tickers) == 1:
+            ticker = tickers[0]
+            tables = [
+                _parse_facts_json(self.get_company_facts(ticker), ticker, self.get_cik(ticker))
+            ]
+            logger.info(f"Extracted {tables[0].num_rows} facts for {ticker}")
+        else:
+            tables = self._parse_in_processes(tickers)
+        # One chunked concat and a single conversion; the per-ticker dictionaries
+        # are merged so the label columns come back as categoricals. Numeric
+        # columns widen across tickers (int64 values next to doubles become
+        # double), as pd.concat did.
+        combined = (
+            pa.concat_tables(tables, promote_options="permissive")
+            .unify_dictionaries()
+            .to_pandas(types_mapper=_ARROW_STRING_DTYPES.get)
+        )
         logger.info(f"Loaded {len(combined)} total facts for {len(tickers)} tickers")
         return combined
+
+    def _download_json(self, cache_key: str, url: str, notes: str) -> Any:
+        """Download a JSON document, cache the response body as-is and parse it.
+
+        The raw body is cached instead of a re-serialized copy, so nothing is
+        encoded twice.
+        """
+        content = self.requester.get(url).content
+        self.cache.store(cache_key, content, url, notes=notes)
+        return orjson.loads(content)
+
+    def _parse_in_processes(self, tickers: list[str]) -> list[pa.Table]:
+        """Flatten cached company facts for several tickers in worker processes.
+
+        Flattening the JSON is CPU-bound, so the cached raw bytes go to a process
+        pool rather than threads.
+        """
+        ciks = [self.get_cik(ticker) for ticker in tickers]
+        sources = [
+            self.cache.load_bytes(f"companyfacts_{ticker}_{cik}.json")
+            or self.get_company_facts(ticker)
+            for ticker, cik in zip(tickers, ciks, strict=True)
+        ]
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(tickers))) as pool:
+            tables = list(pool.map(_parse_facts_json, sources, tickers, ciks))
+        for ticker, table in zip(tickers, tables, strict=True):
+            logger.info(f"Extracted {table.num_rows} facts for {ticker}")
+        return tables
+
+
+def _parse_facts_json(source: bytes | dict[str, Any], ticker: str, cik: str) -> pa.Table:
+    """Flatten XBRL company facts into rows of date, cik, ticker, tag, value, unit, fp, fy, form.
+
+    Module-level so it can run in a worker process.
+
+    Args:
+        source: Raw company facts JSON, or the already parsed document
+        ticker: Stock ticker
+        cik: Zero-padded CIK
+
+    Returns:
+        Arrow table of facts sorted by date, with unparseable dates dropped and
+        the category columns dictionary-encoded
+    """
+    facts_data = orjson.loads(source) if isinstance(source, bytes) else source
+
+    rows = []
+
+    # Navigate the nested structure
+    # facts_data['facts'][taxonomy][tag]['units'][unit] = list of observations
+    for taxonomy, tags in facts_data.get("facts", {}).items():
+        for tag, tag_data in tags.items():
+            for unit, observations in tag_data.get("units", {}).items():
+                for obs in observations:
+                    rows.append(
+                        {
+                            "date": obs.get("end") or obs.get("filed"),
+                            "cik": cik,
+                            "ticker": ticker.upper(),
+                            "tag": f"{taxonomy}:{tag}",
+                            "value": obs.get("val"),
+                            "unit": unit,
+                            "fp": obs.get("fp", ""),
+                            "fy": obs.get("fy"),
+                            "form": obs.get("form", ""),
+                        }
+                    )
+
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+        df = df.dropna(subset=["date"])
+        df = df.sort_values("date").reset_index(drop=True)
+        df = df.astype(dict.fromkeys(CATEGORY_COLUMNS, "category"))
+    return pa.Table.from_pandas(df, preserve_index=False)
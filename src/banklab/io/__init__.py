@@ -0,0 +1,5 @@
+"""File I/O helpers for BankLab."""
+
+from banklab.io.parquet import read_parquet
+
+__all__ = ["read_parquet"]
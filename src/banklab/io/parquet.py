@@ -0,0 +1,23 @@
+"""Parquet reading with column projection."""
+
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+def read_parquet(path: Path | str, columns: list[str] | None = None) -> pd.DataFrame:
+    """Read a parquet file, decoding only the requested columns.
+
+    Column pruning happens in the parquet reader, so unrequested columns are
+    never decompressed. Pandas metadata stored with the file (categoricals,
+    index) is restored as with ``pd.read_parquet``.
+
+    Args:
+        path: Parquet file
+        columns: Columns to read, in the order wanted (all columns if None)
+
+    Returns:
+        DataFrame with the requested columns
+    """
+    return pq.read_table(path, columns=columns).to_pandas()
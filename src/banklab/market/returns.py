@@ -46,18 +46,17 @@ def compute_returns(
     pd.DataFrame
         Columns: ticker, date, price, return, cum_return
     """
-    df = prices.copy()
-    df = df.sort_values(["ticker", "date"])
+    # sort_values already returns a new frame, so columns can be added in place
+    df = prices.sort_values(["ticker", "date"], kind="mergesort")
 
     if method == "log":
         df["return"] = df.groupby("ticker")[price_col].transform(lambda x: np.log(x / x.shift(1)))
     else:
         df["return"] = df.groupby("ticker")[price_col].pct_change()
 
-    # Cumulative returns
-    df["cum_return"] = df.groupby("ticker")["return"].transform(
-        lambda x: (1 + x.fillna(0)).cumprod() - 1
-    )
+    # Cumulative returns (rows are contiguous per ticker after the sort)
+    cum_wealth, _ = _cumulative_wealth(df["ticker"].to_numpy(), df["return"].to_numpy())
+    df["cum_return"] = cum_wealth - 1
 
     return df[["ticker", "date", price_col, "return", "cum_return"]].rename(
         columns={price_col: "price"}
@@ -86,17 +85,17 @@ def compute_rolling_volatility(
     if windows is None:
         windows = [21, 63, 252]
 
-    df = returns.copy()
     annualization = np.sqrt(252)
+    grouped = returns.groupby("ticker")["return"]
 
+    vol_cols = {}
     for window in windows:
-        col_name = f"vol_{window}d"
         w = window  # bind loop variable
-        df[col_name] = df.groupby("ticker")["return"].transform(
+        vol_cols[f"vol_{window}d"] = grouped.transform(
             lambda x, w=w: x.rolling(w, min_periods=w // 2).std() * annualization
         )
 
-    return df
+    return returns.assign(**vol_cols)
 
 
 def compute_drawdowns(returns: pd.DataFrame) -> pd.DataFrame:
@@ -113,20 +112,22 @@ def compute_drawdowns(returns: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         Original data plus: cum_wealth, running_max, drawdown
     """
-    df = returns.copy()
-
-    # Cumulative wealth (starting at 1)
-    df["cum_wealth"] = df.groupby("ticker")["return"].transform(
-        lambda x: (1 + x.fillna(0)).cumprod()
+    # Walk each ticker in date order, then scatter back to the caller's row order
+    order = _ticker_date_order(returns)
+    cum_wealth, running_max = _cumulative_wealth(
+        returns["ticker"].to_numpy()[order], returns["return"].to_numpy()[order]
     )
 
-    # Running maximum
-    df["running_max"] = df.groupby("ticker")["cum_wealth"].transform(lambda x: x.cummax())
-
-    # Drawdown as percentage from peak
-    df["drawdown"] = (df["cum_wealth"] - df["running_max"]) / df["running_max"]
+    # Cumulative wealth (starting at 1) and running maximum
+    cum_wealth = _unsort(cum_wealth, order)
+    running_max = _unsort(running_max, order)
 
-    return df
+    return returns.assign(
+        cum_wealth=cum_wealth,
+        running_max=running_max,
+        # Drawdown as percentage from peak
+        drawdown=(cum_wealth - running_max) / running_max,
+    )
 
 
 def compute_max_drawdown(returns: pd.DataFrame) -> pd.DataFrame:
@@ -142,7 +143,7 @@ def compute_max_drawdown(returns: pd.DataFrame) -> pd.DataFrame:
 
     results = []
     for ticker in df["ticker"].unique():
-        ticker_df = df[df["ticker"] == ticker].copy()
+        ticker_df = df[df["ticker"] == ticker]
         max_dd = ticker_df["drawdown"].min()
 
         # Find drawdown period
@@ -195,8 +196,7 @@ def compute_return_metrics(
     results = []
 
     for ticker in returns["ticker"].unique():
-        ticker_df = returns[returns["ticker"] == ticker].copy()
-        ticker_df = ticker_df.dropna(subset=["return"])
+        ticker_df = returns[returns["ticker"] == ticker].dropna(subset=["return"])
 
         if len(ticker_df) < 21:
             logger.warning(f"Insufficient data for {ticker}: {len(ticker_df)} obs")
@@ -248,17 +248,15 @@ def returns_to_monthly(returns: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         Columns: ticker, year, month, monthly_return, monthly_vol
     """
-    df = returns.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    df["year"] = df["date"].dt.year
-    df["month"] = df["date"].dt.month
+    dates = pd.to_datetime(returns["date"])
+    keys = [returns["ticker"], dates.dt.year.rename("year"), dates.dt.month.rename("month")]
 
     monthly = (
-        df.groupby(["ticker", "year", "month"])
+        returns.groupby(keys)["return"]
         .agg(
-            monthly_return=("return", lambda x: (1 + x).prod() - 1),
-            monthly_vol=("return", lambda x: x.std() * np.sqrt(21)),
-            n_obs=("return", "count"),
+            monthly_return=lambda x: (1 + x).prod() - 1,
+            monthly_vol=lambda x: x.std() * np.sqrt(21),
+            n_obs="count",
         )
         .reset_index()
     )
@@ -275,19 +273,57 @@ def returns_to_quarterly(returns: pd.DataFrame) -> pd.DataFrame:
     pd.DataFrame
         Columns: ticker, year, quarter, quarterly_return, quarterly_vol, n_obs
     """
-    df = returns.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    df["year"] = df["date"].dt.year
-    df["quarter"] = df["date"].dt.quarter
+    dates = pd.to_datetime(returns["date"])
+    keys = [returns["ticker"], dates.dt.year.rename("year"), dates.dt.quarter.rename("quarter")]
 
     quarterly = (
-        df.groupby(["ticker", "year", "quarter"])
+        returns.groupby(keys)["return"]
         .agg(
-            quarterly_return=("return", lambda x: (1 + x).prod() - 1),
-            quarterly_vol=("return", lambda x: x.std() * np.sqrt(63)),
-            n_obs=("return", "count"),
+            quarterly_return=lambda x: (1 + x).prod() - 1,
+            quarterly_vol=lambda x: x.std() * np.sqrt(63),
+            n_obs="count",
         )
         .reset_index()
     )
 
     return quarterly
+
+
+def _ticker_date_order(df: pd.DataFrame) -> np.ndarray:
+    """Positional indexer that sorts rows by (ticker, date), stable within ties."""
+    keys = df[["ticker", "date"]].reset_index(drop=True)
+    return keys.sort_values(["ticker", "date"], kind="mergesort").index.to_numpy()
+
+
+def _unsort(values: np.ndarray, order: np.ndarray) -> np.ndarray:
+    """Undo a positional sort so values line up with the original rows."""
+    out = np.empty_like(values)
+    out[order] = values
+    return out
+
+
+def _cumulative_wealth(tickers: np.ndarray, returns: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Cumulative wealth and running maximum per ticker.
+
+    Rows must already be grouped contiguously by ticker and ordered by date.
+    Missing returns count as zero; rows with a missing ticker stay NaN, matching
+    pandas groupby semantics.
+    """
+    r = returns.astype(np.float64)
+    r = np.where(np.isnan(r), 0.0, r)
+
+    cum_wealth = np.full(len(r), np.nan)
+    running_max = np.full(len(r), np.nan)
+
+    codes, _ = pd.factorize(tickers)
+    breaks = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks, [len(codes)]))
+
+    for start, end in zip(starts, ends, strict=True):
+        if start == end or codes[start] < 0:
+            continue
+        cum_wealth[start:end] = np.cumprod(1.0 + r[start:end])
+        running_max[start:end] = np.maximum.accumulate(cum_wealth[start:end])
+
+    return cum_wealth, running_max
@@ -13,8 +13,10 @@ Output Files
 """
 
 import logging
+from functools import cached_property
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from banklab.clean.xbrl_normalize import XBRLNormalizer
@@ -37,6 +39,11 @@ class FundamentalsPipeline:
         self.config = config or DEFAULT_CONFIG
         self.config.ensure_dirs()
 
+    @cached_property
+    def normalizer(self) -> XBRLNormalizer:
+        """XBRL normalizer shared by every pipeline step."""
+        return XBRLNormalizer(self.config)
+
     def run(self) -> dict[str, Path]:
         """Run full fundamentals pipeline.
 
@@ -56,8 +63,7 @@ class FundamentalsPipeline:
 
         # Step 2: Create wide format
         logger.info("Step 2: Creating wide format...")
-        normalizer = XBRLNormalizer(self.config)
-        wide = normalizer.to_wide_format(normalized)
+        wide = self.normalizer.to_wide_format(normalized)
         outputs["fundamentals_quarterly_wide"] = self._save_wide(wide)
 
         # Step 3: Calculate KPIs
@@ -67,15 +73,9 @@ class FundamentalsPipeline:
 
         # Step 4: Run quality checks
         logger.info("Step 4: Running quality checks...")
-        # Merge KPIs into wide for checking
-        wide_with_kpis = wide.merge(
-            kpis.pivot(
-                index=["ticker", "fiscal_year", "fiscal_period"], columns="kpi_name", values="value"
-            ).reset_index(),
-            on=["ticker", "fiscal_year", "fiscal_period"],
-            how="left",
-        )
-        quality_report = run_all_checks(wide_with_kpis)
+        # Ratio checks read the long KPI frame directly, so there is no need
+        # to pivot every KPI and merge it back onto the wide fundamentals.
+        quality_report = run_all_checks(wide, kpis=kpis)
         outputs["quality_report"] = self._save_quality_report(quality_report)
 
         # Step 5: Generate data dictionary
@@ -102,53 +102,50 @@ class FundamentalsPipeline:
         raw_facts = pd.read_parquet(raw_path)
         logger.info(f"Loaded {len(raw_facts):,} raw facts")
 
-        normalizer = XBRLNormalizer(self.config)
-        normalized = normalizer.normalize(raw_facts)
+        normalized = self.normalizer.normalize(raw_facts)
 
         return normalized
 
     def _calculate_kpis(self, wide: pd.DataFrame) -> pd.DataFrame:
         """Calculate all KPIs from wide-format fundamentals."""
-        records = []
+        # Accumulate per-column arrays rather than a list of per-row dicts so the
+        # frame is built from typed columns without per-record key inference.
+        tickers, fiscal_years, fiscal_periods, dates, names, values = [], [], [], [], [], []
 
         for _, row in wide.iterrows():
             kpis = calculate_all_kpis(row)
 
             for kpi_name, value in kpis.items():
                 if pd.notna(value):
-                    records.append(
-                        {
-                            "ticker": row["ticker"],
-                            "fiscal_year": row["fiscal_year"],
-                            "fiscal_period": row["fiscal_period"],
-                            "date": row["date"],
-                            "kpi_name": kpi_name,
-                            "value": value,
-                        }
-                    )
-
-        kpis_df = pd.DataFrame(records)
-
-        # Add metadata from definitions
-        def get_display_name(name):
-            return KPI_DEFINITIONS.get(name, {}).display_name if name in KPI_DEFINITIONS else name
-
-        def get_category(name):
-            return KPI_DEFINITIONS.get(name, {}).category if name in KPI_DEFINITIONS else "other"
-
-        def get_unit(name):
-            return KPI_DEFINITIONS.get(name, {}).unit if name in KPI_DEFINITIONS else "unknown"
-
-        kpis_df["display_name"] = kpis_df["kpi_name"].apply(
-            lambda x: KPI_DEFINITIONS[x].display_name if x in KPI_DEFINITIONS else x
-        )
-        kpis_df["category"] = kpis_df["kpi_name"].apply(
-            lambda x: KPI_DEFINITIONS[x].category if x in KPI_DEFINITIONS else "other"
-        )
-        kpis_df["unit"] = kpis_df["kpi_name"].apply(
-            lambda x: KPI_DEFINITIONS[x].unit if x in KPI_DEFINITIONS else "unknown"
+                    tickers.append(row["ticker"])
+                    fiscal_years.append(row["fiscal_year"])
+                    fiscal_periods.append(row["fiscal_period"])
+                    dates.append(row["date"])
+                    names.append(kpi_name)
+                    values.append(value)
+
+        categories = [*KPI_DEFINITIONS, *sorted(set(names).difference(KPI_DEFINITIONS))]
+        kpis_df = pd.DataFrame(
+            {
+                "ticker": np.array(tickers, dtype=object),
+                "fiscal_year": np.array(fiscal_years, dtype="int32"),
+                "fiscal_period": np.array(fiscal_periods, dtype=object),
+                "date": np.array(dates, dtype=object),
+                "kpi_name": pd.Categorical(names, categories=categories),
+                "value": np.array(values, dtype="float64"),
+            }
         )
 
+        # Add metadata from definitions (one hash-table lookup per column)
+        display_map = {k: v.display_name for k, v in KPI_DEFINITIONS.items()}
+        category_map = {k: v.category for k, v in KPI_DEFINITIONS.items()}
+        unit_map = {k: v.unit for k, v in KPI_DEFINITIONS.items()}
+
+        kpi_names = kpis_df["kpi_name"].astype(object)
+        kpis_df["display_name"] = kpi_names.map(display_map).fillna(kpi_names)
+        kpis_df["category"] = kpi_names.map(category_map).fillna("other")
+        kpis_df["unit"] = kpi_names.map(unit_map).fillna("unknown")
+
         logger.info(f"Calculated {len(kpis_df):,} KPI observations")
         return kpis_df
 
@@ -189,8 +186,7 @@ class FundamentalsPipeline:
 
     def _save_data_dictionary(self) -> Path:
         """Save data dictionary."""
-        normalizer = XBRLNormalizer(self.config)
-        data_dict = normalizer.get_data_dictionary()
+        data_dict = self.normalizer.get_data_dictionary()
 
         path = self.config.processed_dir / "data_dictionary.csv"
         data_dict.to_csv(path, index=False)
@@ -7,9 +7,11 @@ import logging
 from pathlib import Path
 
 import pandas as pd
+import pyarrow.parquet as pq
 
 from banklab.config import DEFAULT_CONFIG, Config
 from banklab.ingest import FactorsLoader, MacroLoader, MarketLoader, SECLoader
+from banklab.quality.checks import has_duplicates
 
 logger = logging.getLogger(__name__)
 
@@ -41,12 +43,18 @@ class DataPipeline:
 
         Returns:
             Path to output parquet file
+
+        Raises:
+            ValueError: If a (date, ticker) pair appears more than once
         """
         logger.info("Processing prices...")
         loader = MarketLoader(self.config)
 
-        df = loader.load_all_tickers(force_refresh=force_refresh)
+        with loader.manifest.batch():
+            df = loader.load_all_tickers(force_refresh=force_refresh)
         output = loader.to_parquet_schema(df)
+        if has_duplicates(output, ["date", "ticker"]):
+            raise ValueError("Prices contain duplicate (date, ticker) rows")
 
         output_path = self.config.processed_dir / "prices_daily.parquet"
         output.to_parquet(output_path, index=False)
@@ -66,7 +74,8 @@ class DataPipeline:
         logger.info("Processing factors...")
         loader = FactorsLoader(self.config)
 
-        df = loader.download_factors(force_refresh=force_refresh)
+        with loader.manifest.batch():
+            df = loader.download_factors(force_refresh=force_refresh)
         output = loader.to_parquet_schema(df)
 
         output_path = self.config.processed_dir / "factors_daily.parquet"
@@ -92,7 +101,8 @@ class DataPipeline:
             logger.warning(f"Skipping macro data: {e}")
             return None
 
-        df = loader.load_all_series(force_refresh=force_refresh)
+        with loader.manifest.batch():
+            df = loader.load_all_series(force_refresh=force_refresh)
         output = loader.to_parquet_schema(df)
 
         output_path = self.config.processed_dir / "macro_monthly.parquet"
@@ -113,7 +123,8 @@ class DataPipeline:
         logger.info("Processing fundamentals...")
         loader = SECLoader(self.config)
 
-        df = loader.load_all_tickers()
+        with loader.manifest.batch():
+            df = loader.load_all_tickers()
 
         # Standardize for parquet
         output = df.copy()
@@ -173,8 +184,8 @@ class DataPipeline:
         for filename in expected_files:
             path = self.config.processed_dir / filename
             if path.exists():
-                df = pd.read_parquet(path)
-                results[filename] = len(df) > 0
+                # Footer metadata is enough to know the row count
+                results[filename] = pq.read_metadata(path).num_rows > 0
             else:
                 results[filename] = False
 
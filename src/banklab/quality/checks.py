@@ -1,14 +1,23 @@
 """Data quality checks for normalized financial data."""
 
 import logging
+from array import array
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+RATIO_BOUNDS = {
+    "leverage": (4, 20),
+    "roe": (-0.50, 0.50),
+    "roa": (-0.10, 0.10),
+}
+RATIO_KPIS = list(RATIO_BOUNDS)
+
 
 class Severity(Enum):
     INFO = "info"
@@ -16,6 +25,13 @@ class Severity(Enum):
     ERROR = "error"
 
 
+# Least to most severe; the category order of to_dataframe()'s severity column
+SEVERITY_ORDER = [s.value for s in Severity]
+# Severity <-> int8 code, matching positions in SEVERITY_ORDER
+_SEVERITY_CODES = {s: i for i, s in enumerate(Severity)}
+_SEVERITY_BY_CODE = list(Severity)
+
+
 @dataclass
 class QualityWarning:
     check_name: str
@@ -26,38 +42,80 @@ class QualityWarning:
     details: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
 class QualityReport:
-    warnings: list[QualityWarning] = field(default_factory=list)
-    checks_run: list[str] = field(default_factory=list)
+    """Warnings from a quality-check run, stored as parallel per-field lists.
+
+    Keeping one list per field makes ``to_dataframe`` a straight column copy;
+    ``warnings`` rebuilds ``QualityWarning`` objects on demand as a read-only
+    tuple, so new warnings must go through ``add()``. Severities are packed as
+    int8 codes, which become the categorical codes directly.
+    """
+
+    def __init__(
+        self,
+        warnings: list[QualityWarning] | None = None,
+        checks_run: list[str] | None = None,
+    ) -> None:
+        self.checks_run: list[str] = checks_run if checks_run is not None else []
+        self._check_names: list[str] = []
+        self._severity_codes = array("b")
+        self._tickers: list[str] = []
+        self._periods: list[str] = []
+        self._messages: list[str] = []
+        self._details: list[dict[str, Any]] = []
+        # Running count per severity, kept in step by add()
+        self._counts = dict.fromkeys(Severity, 0)
+        for warning in warnings or ():
+            self.add(warning)
+
+    @property
+    def warnings(self) -> tuple[QualityWarning, ...]:
+        # A tuple, so report.warnings.append(...) fails loudly instead of
+        # appending to a throwaway copy
+        return tuple(
+            QualityWarning(*fields)
+            for fields in zip(
+                self._check_names,
+                map(_SEVERITY_BY_CODE.__getitem__, self._severity_codes),
+                self._tickers,
+                self._periods,
+                self._messages,
+                self._details,
+                strict=True,
+            )
+        )
 
     def add(self, warning: QualityWarning) -> None:
-        self.warnings.append(warning)
+        self._counts[warning.severity] += 1
+        self._check_names.append(warning.check_name)
+        self._severity_codes.append(_SEVERITY_CODES[warning.severity])
+        self._tickers.append(warning.ticker)
+        self._periods.append(warning.period)
+        self._messages.append(warning.message)
+        self._details.append(warning.details)
 
     def has_errors(self) -> bool:
-        return any(w.severity == Severity.ERROR for w in self.warnings)
+        return self._counts[Severity.ERROR] > 0
 
     def summary(self) -> dict[str, int]:
-        counts = {"error": 0, "warning": 0, "info": 0}
-        for w in self.warnings:
-            counts[w.severity.value] += 1
-        return counts
+        return {s.value: self._counts[s] for s in (Severity.ERROR, Severity.WARNING, Severity.INFO)}
 
     def to_dataframe(self) -> pd.DataFrame:
-        if not self.warnings:
+        if not self._severity_codes:
             return pd.DataFrame()
-        records = []
-        for w in self.warnings:
-            records.append(
-                {
-                    "check_name": w.check_name,
-                    "severity": w.severity.value,
-                    "ticker": w.ticker,
-                    "period": w.period,
-                    "message": w.message,
-                }
-            )
-        return pd.DataFrame(records)
+        return pd.DataFrame(
+            {
+                "check_name": pd.Categorical(self._check_names),
+                "severity": pd.Categorical.from_codes(
+                    np.array(self._severity_codes, dtype=np.int8),
+                    categories=SEVERITY_ORDER,
+                    ordered=True,
+                ),
+                "ticker": self._tickers,
+                "period": self._periods,
+                "message": self._messages,
+            }
+        )
 
     def __repr__(self) -> str:
         return f"QualityReport(checks={len(self.checks_run)})"
@@ -72,29 +130,27 @@ def check_balance_sheet_identity(
     required = ["total_assets", "total_liabilities", "total_equity"]
     if not all(col in df.columns for col in required):
         return
-    for _, row in df.iterrows():
-        assets = row.get("total_assets")
-        liabilities = row.get("total_liabilities")
-        equity = row.get("total_equity")
-        if pd.isna(assets) or pd.isna(liabilities) or pd.isna(equity):
-            continue
-        if assets == 0:
-            continue
-        expected = liabilities + equity
-        diff = abs(assets - expected)
-        rel_diff = diff / abs(assets)
-        if rel_diff > tolerance:
-            period = f"{row.get('fiscal_year', '')}-{row.get('fiscal_period', '')}"
-            report.add(
-                QualityWarning(
-                    check_name="balance_sheet_identity",
-                    severity=Severity.WARNING,
-                    ticker=row.get("ticker", ""),
-                    period=period,
-                    message=f"Balance sheet doesn't balance: A={assets:,.0f}, L+E={expected:,.0f}",
-                    details={"diff": diff, "rel_diff": rel_diff},
-                )
+    assets, liabilities, equity = (_float_column(df, col) for col in required)
+    expected = liabilities + equity
+    diff = np.abs(assets - expected)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rel_diff = diff / np.abs(assets)
+    # NaN inputs and zero assets compare False here, matching the skip rules
+    violations = np.flatnonzero((assets != 0) & (rel_diff > tolerance))
+    for i in violations:
+        ticker, period = _row_label(df, i)
+        report.add(
+            QualityWarning(
+                check_name="balance_sheet_identity",
+                severity=Severity.WARNING,
+                ticker=ticker,
+                period=period,
+                message=(
+                    f"Balance sheet doesn't balance: A={assets[i]:,.0f}, L+E={expected[i]:,.0f}"
+                ),
+                details={"diff": diff[i], "rel_diff": rel_diff[i]},
             )
+        )
 
 
 def check_positive_values(df: pd.DataFrame, report: QualityReport) -> None:
@@ -107,62 +163,51 @@ def check_positive_values(df: pd.DataFrame, report: QualityReport) -> None:
         "loans_net",
         "shares_outstanding",
     ]
-    for col in positive_cols:
-        if col not in df.columns:
-            continue
-        for _, row in df.iterrows():
-            val = row.get(col)
-            if pd.notna(val) and val < 0:
-                period = f"{row.get('fiscal_year', '')}-{row.get('fiscal_period', '')}"
-                report.add(
-                    QualityWarning(
-                        check_name="positive_values",
-                        severity=Severity.ERROR,
-                        ticker=row.get("ticker", ""),
-                        period=period,
-                        message=f"{col} is negative: {val:,.0f}",
-                        details={"column": col, "value": val},
-                    )
-                )
+    cols = [col for col in positive_cols if col in df.columns]
+    if not cols:
+        return
+    arr = df[cols].to_numpy(dtype=float, na_value=np.nan)
+    # NaN < 0 is False, so missing values never flag. Transpose to report column by column.
+    col_idx, rows = np.nonzero((arr < 0).T)
+    for j, i in zip(col_idx, rows, strict=True):
+        col, val = cols[j], arr[i, j]
+        ticker, period = _row_label(df, i)
+        report.add(
+            QualityWarning(
+                check_name="positive_values",
+                severity=Severity.ERROR,
+                ticker=ticker,
+                period=period,
+                message=f"{col} is negative: {val:,.0f}",
+                details={"column": col, "value": val},
+            )
+        )
 
 
 def check_reasonable_ratios(df: pd.DataFrame, report: QualityReport) -> None:
     report.checks_run.append("reasonable_ratios")
-    ratio_bounds = {
-        "leverage": (4, 20),
-        "roe": (-0.50, 0.50),
-        "roa": (-0.10, 0.10),
-    }
-    for col, (low, high) in ratio_bounds.items():
-        if col not in df.columns:
-            continue
-        for _, row in df.iterrows():
-            val = row.get(col)
-            if pd.isna(val):
-                continue
-            period = f"{row.get('fiscal_year', '')}-{row.get('fiscal_period', '')}"
-            if val < low:
-                report.add(
-                    QualityWarning(
-                        check_name="reasonable_ratios",
-                        severity=Severity.WARNING,
-                        ticker=row.get("ticker", ""),
-                        period=period,
-                        message=f"{col} is unusually low: {val:.4f}",
-                        details={"column": col, "value": val},
-                    )
-                )
-            elif val > high:
-                report.add(
-                    QualityWarning(
-                        check_name="reasonable_ratios",
-                        severity=Severity.WARNING,
-                        ticker=row.get("ticker", ""),
-                        period=period,
-                        message=f"{col} is unusually high: {val:.4f}",
-                        details={"column": col, "value": val},
-                    )
-                )
+    cols = [col for col in RATIO_BOUNDS if col in df.columns]
+    if not cols:
+        return
+    arr = df[cols].to_numpy(dtype=float, na_value=np.nan)
+    low, high = np.array([RATIO_BOUNDS[col] for col in cols], dtype=float).T
+    # Broadcast each column's bounds over its rows; NaN compares False on both sides
+    too_low = arr < low
+    col_idx, rows = np.nonzero((too_low | (arr > high)).T)
+    for j, i in zip(col_idx, rows, strict=True):
+        col, val = cols[j], arr[i, j]
+        ticker, period = _row_label(df, i)
+        direction = "low" if too_low[i, j] else "high"
+        report.add(
+            QualityWarning(
+                check_name="reasonable_ratios",
+                severity=Severity.WARNING,
+                ticker=ticker,
+                period=period,
+                message=f"{col} is unusually {direction}: {val:.4f}",
+                details={"column": col, "value": val},
+            )
+        )
 
 
 def check_temporal_consistency(
@@ -181,28 +226,73 @@ def check_completeness(
     report.checks_run.append("completeness")
     if required_items is None:
         required_items = ["total_assets", "total_equity", "net_income"]
-    for ticker in df["ticker"].unique() if "ticker" in df.columns else []:
-        for item in required_items:
-            if item not in df.columns:
-                report.add(
-                    QualityWarning(
-                        check_name="completeness",
-                        severity=Severity.ERROR,
-                        ticker=ticker,
-                        period="all",
-                        message=f"Missing required line item: {item}",
-                        details={"item": item},
-                    )
+    if "ticker" not in df.columns:
+        return
+    # Column presence is the same for every ticker, so resolve it once
+    columns = set(df.columns)
+    missing = [item for item in required_items if item not in columns]
+    if not missing:
+        return
+    for ticker in df["ticker"].unique():
+        for item in missing:
+            report.add(
+                QualityWarning(
+                    check_name="completeness",
+                    severity=Severity.ERROR,
+                    ticker=ticker,
+                    period="all",
+                    message=f"Missing required line item: {item}",
+                    details={"item": item},
                 )
+            )
+
+
+def has_duplicates(df: pd.DataFrame, subset: list[str]) -> bool:
+    """Whether any two rows share the same values in ``subset``.
+
+    Uses ``duplicated`` with the default ``keep="first"``: a single hash pass
+    that only has to find a repeat, not mark every member of a duplicate group.
+    """
+    return bool(df.duplicated(subset=subset).any())
 
 
-def run_all_checks(df: pd.DataFrame, include_kpi_checks: bool = True) -> QualityReport:
+def run_all_checks(
+    df: pd.DataFrame,
+    include_kpi_checks: bool = True,
+    kpis: pd.DataFrame | None = None,
+) -> QualityReport:
     report = QualityReport()
     check_balance_sheet_identity(df, report)
     check_positive_values(df, report)
     check_temporal_consistency(df, report)
     check_completeness(df, report)
     if include_kpi_checks:
-        check_reasonable_ratios(df, report)
+        ratios = df if kpis is None else _ratio_frame(kpis)
+        check_reasonable_ratios(ratios, report)
     logger.info(f"Quality checks complete: {report}")
     return report
+
+
+def _ratio_frame(kpis: pd.DataFrame) -> pd.DataFrame:
+    """Pivot only the KPIs checked by check_reasonable_ratios out of long format."""
+    subset = kpis[kpis["kpi_name"].isin(RATIO_KPIS)]
+    return subset.pivot_table(
+        index=["ticker", "fiscal_year", "fiscal_period"],
+        columns="kpi_name",
+        values="value",
+        aggfunc="first",
+        observed=True,
+    ).reset_index()
+
+
+def _float_column(df: pd.DataFrame, col: str) -> np.ndarray:
+    return df[col].to_numpy(dtype=float, na_value=np.nan)
+
+
+def _row_label(df: pd.DataFrame, i: int) -> tuple[str, str]:
+    """Ticker and 'fiscal_year-fiscal_period' label for positional row i."""
+
+    def value(col: str):
+        return df[col].iat[i] if col in df.columns else ""
+
+    return value("ticker"), f"{value('fiscal_year')}-{value('fiscal_period')}"
@@ -7,15 +7,19 @@ Usage:
     python -m banklab.run --stage all            # Full pipeline
 """
 
-import argparse
 import logging
 import subprocess
 import sys
+from collections.abc import Callable
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
 from banklab.config import Config
-from banklab.process.pipeline import DataPipeline
+
+if TYPE_CHECKING:
+    import argparse
+
+    from banklab.process.pipeline import DataPipeline
 
 # Configure logging
 logging.basicConfig(
@@ -25,10 +29,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+Stage = Literal["data", "fundamentals", "report", "all"]
+
 
-def run_data(config: Config, force_refresh: bool = False) -> None:
+def run_data(
+    config: Config, force_refresh: bool = False, pipeline: "DataPipeline | None" = None
+) -> None:
     """Run data download and processing pipeline."""
-    pipeline = DataPipeline(config)
+    pipeline = pipeline or _data_pipeline(config)
     pipeline.run_all(force_refresh=force_refresh)
 
 
@@ -40,8 +48,13 @@ def run_fundamentals(config: Config) -> None:
     pipeline.run()
 
 
-def run_report(config: Config) -> None:
-    """Generate analysis report from processed data."""
+def run_report(config: Config, pipeline: "DataPipeline | None" = None) -> None:
+    """Generate analysis report from processed data.
+
+    Args:
+        config: BankLab configuration
+        pipeline: DataPipeline to reuse for output validation (built on demand if omitted)
+    """
     logger.info("Generating analysis report...")
 
     # Check if Quarto is available
@@ -50,32 +63,40 @@ def run_report(config: Config) -> None:
         logger.error(f"Report template not found at {report_path}")
         sys.exit(1)
 
-    # Try to render with Quarto
+    # Try to render with Quarto, streaming its output as it renders
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             ["quarto", "render", str(report_path)],
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
             text=True,
         )
-        if result.returncode == 0:
-            logger.info("Report rendered successfully!")
-            logger.info("Output: reports/fundamentals_review.html")
-        else:
-            logger.warning("Quarto render failed. Falling back to summary mode.")
-            logger.warning(f"Error: {result.stderr}")
-            _run_summary_report(config)
     except FileNotFoundError:
         logger.warning("Quarto not found. Install from https://quarto.org")
         logger.info("Falling back to text summary...")
-        _run_summary_report(config)
+        _run_summary_report(config, pipeline)
+        return
+
+    with proc:
+        for line in proc.stdout:
+            logger.info(f"quarto: {line.rstrip()}")
+    returncode = proc.wait()
+
+    if returncode == 0:
+        logger.info("Report rendered successfully!")
+        logger.info("Output: reports/fundamentals_review.html")
+    else:
+        logger.warning(
+            f"Quarto render failed (exit code {returncode}). Falling back to summary mode."
+        )
+        _run_summary_report(config, pipeline)
 
 
-def _run_summary_report(config: Config) -> None:
+def _run_summary_report(config: Config, pipeline: "DataPipeline | None" = None) -> None:
     """Generate text summary when Quarto is not available."""
-    import pandas as pd
-
     # Validate data exists
-    pipeline = DataPipeline(config)
+    pipeline = pipeline or _data_pipeline(config)
     validation = pipeline.validate_outputs()
 
     missing = [f for f, valid in validation.items() if not valid]
@@ -88,59 +109,105 @@ def _run_summary_report(config: Config) -> None:
     logger.info("Data Summary Report")
     logger.info("=" * 60)
 
+    # Row counts and date ranges come from the parquet footers; only the
+    # columns needed for distinct values are actually read.
+    processed = config.processed_dir
+
     # Prices summary
-    prices = pd.read_parquet(config.processed_dir / "prices_daily.parquet")
-    logger.info(f"\nPrices: {len(prices)} records")
-    logger.info(f"  Date range: {prices['date'].min()} to {prices['date'].max()}")
-    logger.info(f"  Tickers: {prices['ticker'].unique().tolist()}")
+    prices_path = processed / "prices_daily.parquet"
+    logger.info(f"\nPrices: {_parquet_num_rows(prices_path)} records")
+    start, end = _parquet_date_range(prices_path)
+    logger.info(f"  Date range: {start} to {end}")
+    logger.info(f"  Tickers: {_parquet_unique(prices_path, 'ticker')}")
 
     # Factors summary
-    factors = pd.read_parquet(config.processed_dir / "factors_daily.parquet")
-    logger.info(f"\nFactors: {len(factors)} records")
-    logger.info(f"  Date range: {factors['date'].min()} to {factors['date'].max()}")
+    factors_path = processed / "factors_daily.parquet"
+    logger.info(f"\nFactors: {_parquet_num_rows(factors_path)} records")
+    start, end = _parquet_date_range(factors_path)
+    logger.info(f"  Date range: {start} to {end}")
 
     # Macro summary (if exists)
-    macro_path = config.processed_dir / "macro_monthly.parquet"
+    macro_path = processed / "macro_monthly.parquet"
     if macro_path.exists():
-        macro = pd.read_parquet(macro_path)
-        logger.info(f"\nMacro: {len(macro)} records")
-        logger.info(f"  Series: {macro['series_id'].unique().tolist()}")
+        logger.info(f"\nMacro: {_parquet_num_rows(macro_path)} records")
+        logger.info(f"  Series: {_parquet_unique(macro_path, 'series_id')}")
 
     # Fundamentals summary
-    fundamentals = pd.read_parquet(config.processed_dir / "fundamentals_raw_facts.parquet")
-    logger.info(f"\nFundamentals (raw): {len(fundamentals)} records")
-    logger.info(f"  Tickers: {fundamentals['ticker'].unique().tolist()}")
-    logger.info(f"  Unique tags: {fundamentals['tag'].nunique()}")
+    fundamentals_path = processed / "fundamentals_raw_facts.parquet"
+    logger.info(f"\nFundamentals (raw): {_parquet_num_rows(fundamentals_path)} records")
+    logger.info(f"  Tickers: {_parquet_unique(fundamentals_path, 'ticker')}")
+    logger.info(f"  Unique tags: {_parquet_count_distinct(fundamentals_path, 'tag')}")
 
     # KPIs summary (if exists)
-    kpis_path = config.processed_dir / "kpis_quarterly.parquet"
+    kpis_path = processed / "kpis_quarterly.parquet"
     if kpis_path.exists():
-        kpis = pd.read_parquet(kpis_path)
-        logger.info(f"\nKPIs: {len(kpis)} records")
-        logger.info(f"  KPI types: {kpis['kpi_name'].nunique()}")
+        logger.info(f"\nKPIs: {_parquet_num_rows(kpis_path)} records")
+        logger.info(f"  KPI types: {_parquet_count_distinct(kpis_path, 'kpi_name')}")
 
     logger.info("\n" + "=" * 60)
 
 
-def main() -> None:
+# Stage runners in execution order; "all" runs each of them in turn
+_STAGES: dict[str, Callable[[Config, bool, "DataPipeline | None"], None]] = {
+    "data": lambda config, force_refresh, pipeline: run_data(config, force_refresh, pipeline),
+    "fundamentals": lambda config, force_refresh, pipeline: run_fundamentals(config),
+    "report": lambda config, force_refresh, pipeline: run_report(config, pipeline),
+}
+
+
+def main(argv: list[str] | None = None) -> None:
     """CLI entry point."""
-    parser = argparse.ArgumentParser(
-        description="BankLab: JPM vs Morgan Stanley Analytics Platform",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+    argv = sys.argv[1:] if argv is None else argv
+
+    # A bare invocation runs everything with defaults; skip argparse entirely
+    if argv:
+        args = _parse_args(argv)
+        stage: Stage = args.stage
+        force_refresh: bool = args.force_refresh
+        data_dir: str | None = args.data_dir
+    else:
+        stage, force_refresh, data_dir = "all", False, None
+
+    # Build config
+    config = Config()
+    if data_dir:
+        config.data_dir = Path(data_dir)
+
+    # One DataPipeline shared by the data and report stages; a lone report
+    # stage only builds it if it has to fall back to the text summary
+    pipeline = _data_pipeline(config) if stage in ("data", "all") else None
+
+    for name in _STAGES if stage == "all" else (stage,):
+        _STAGES[name](config, force_refresh, pipeline)
+
+    logger.info("Done!")
+
+
+_EPILOG = """
 Examples:
   python -m banklab.run --stage data           Download raw data
   python -m banklab.run --stage fundamentals   Normalize facts + calculate KPIs
   python -m banklab.run --stage report         Generate Quarto report
   python -m banklab.run --stage all            Full pipeline
   python -m banklab.run --stage data -f        Force refresh all data
-        """,
+"""
+
+
+def _parse_args(argv: list[str]) -> "argparse.Namespace":
+    """Parse CLI arguments; the usage examples are only attached for --help."""
+    import argparse
+
+    wants_help = "-h" in argv or "--help" in argv
+    parser = argparse.ArgumentParser(
+        description="BankLab: JPM vs Morgan Stanley Analytics Platform",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=_EPILOG if wants_help else None,
     )
 
     parser.add_argument(
         "--stage",
         type=str,
-        choices=["data", "fundamentals", "report", "all"],
+        choices=[*_STAGES, "all"],
         default="all",
         help="Pipeline stage to run (default: all)",
     )
@@ -157,26 +224,65 @@ Examples:
         help="Override data directory",
     )
 
-    args = parser.parse_args()
+    return parser.parse_args(argv)
 
-    # Build config
-    config = Config()
-    if args.data_dir:
-        config.data_dir = Path(args.data_dir)
 
-    # Run requested stage
-    stage: Literal["data", "fundamentals", "report", "all"] = args.stage
+def _data_pipeline(config: Config) -> "DataPipeline":
+    """Build a DataPipeline, importing it (and pandas) only when needed."""
+    from banklab.process.pipeline import DataPipeline
 
-    if stage in ("data", "all"):
-        run_data(config, force_refresh=args.force_refresh)
+    return DataPipeline(config)
 
-    if stage in ("fundamentals", "all"):
-        run_fundamentals(config)
 
-    if stage in ("report", "all"):
-        run_report(config)
+def _parquet_num_rows(path: Path) -> int:
+    """Row count from the parquet footer, without reading any data pages."""
+    import pyarrow.parquet as pq
 
-    logger.info("Done!")
+    return pq.read_metadata(path).num_rows
+
+
+def _parquet_date_range(path: Path, column: str = "date") -> tuple:
+    """Min and max of a column from row-group statistics.
+
+    Falls back to reading just that column if any row group lacks statistics.
+    """
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_metadata(path)
+    idx = metadata.schema.to_arrow_schema().get_field_index(column)
+    stats = [metadata.row_group(i).column(idx).statistics for i in range(metadata.num_row_groups)]
+    if stats and all(s is not None and s.has_min_max for s in stats):
+        return min(s.min for s in stats), max(s.max for s in stats)
+
+    values = pq.read_table(path, columns=[column]).column(column)
+    bounds = pc.min_max(values)
+    return bounds["min"].as_py(), bounds["max"].as_py()
+
+
+def _parquet_unique(path: Path, column: str) -> list:
+    """Distinct values of one column, in order of first appearance."""
+    import pyarrow.compute as pc
+
+    return pc.unique(_parquet_column(path, column)).to_pylist()
+
+
+def _parquet_count_distinct(path: Path, column: str) -> int:
+    """Number of distinct non-null values in one column."""
+    import pyarrow.compute as pc
+
+    return pc.count_distinct(_parquet_column(path, column)).as_py()
+
+
+def _parquet_column(path: Path, column: str):
+    """Read one column, decoding categoricals (dictionary arrays) to their values."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    values = pq.read_table(path, columns=[column]).column(column)
+    if pa.types.is_dictionary(values.type):
+        values = values.cast(values.type.value_type)
+    return values
 
 
 if __name__ == "__main__":
@@ -1,19 +1,59 @@
 """Caching and data manifest utilities."""
 
+import atexit
 import hashlib
+import io
 import logging
+import mmap
+import os
+import tempfile
+import weakref
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import yaml
+import orjson
+import zstandard
 
 logger = logging.getLogger(__name__)
 
+# Characters in cache keys that are unsafe in filenames (or need quoting in shells)
+_KEY_TRANS = str.maketrans(dict.fromkeys('/\\?&=:#%<>"|*', "_"))
+
+# Sanitized keys longer than this are truncated and suffixed with a digest of
+# the full key, keeping filenames under the usual 255-byte limit
+_MAX_KEY_LENGTH = 200
+
+# Cached payloads larger than this are stored zstd-compressed
+COMPRESS_THRESHOLD = 64 * 1024
+
+# Files written above this size are preallocated before writing
+_PREALLOCATE_THRESHOLD = 1 << 20
+
+# Cached JSON at least this large is parsed from a memory map
+_MMAP_THRESHOLD = 1 << 20
+
+# Read size when hashing files
+_HASH_CHUNK_SIZE = 1 << 20
+
+# Manifest entry fields that decide whether a re-recorded file changed
+_ENTRY_IDENTITY_FIELDS = ("source_url", "file_hash", "hash_algo", "local_path", "notes")
+
 
 class DataManifest:
     """Manages data provenance manifest (data_manifest.yml).
 
+    The manifest is stored as JSON, a subset of YAML, so the file keeps its
+    name and stays readable by YAML tooling. Older block-style YAML manifests
+    are still loaded and are rewritten as JSON on the next save.
+
+    Used as a context manager, saves are deferred until the block exits;
+    anything still pending is saved at interpreter exit.
+
     Tracks:
     - Source URLs
     - Download timestamps
@@ -21,27 +61,129 @@ class DataManifest:
     - Notes/metadata
     """
 
-    def __init__(self, manifest_path: Path):
+    # Hashes identify files rather than secure them; faster algorithms such as
+    # blake2b can be chosen per manifest
+    HASH_ALGO = "sha256"
+
+    def __init__(self, manifest_path: Path, hash_algo: str | None = None):
         """Initialize manifest manager.
 
         Args:
             manifest_path: Path to data_manifest.yml file
+            hash_algo: hashlib algorithm for file hashes (defaults to HASH_ALGO)
+
+        Raises:
+            ValueError: If hashlib does not support hash_algo
         """
         self.manifest_path = manifest_path
+        self.hash_algo = hash_algo or self.HASH_ALGO
+        hashlib.new(self.hash_algo)  # Fail early on unsupported algorithms
         self._data: dict[str, Any] = self._load()
+        # file_key -> (size, mtime_ns, hash) of the last recorded version of each
+        # file; entries hashed with another algorithm are never reused
+        self._hash_cache: dict[str, tuple[int, int, str]] = {
+            key: (entry["file_size"], entry["file_mtime_ns"], entry["file_hash"])
+            for key, entry in self._data["files"].items()
+            if "file_size" in entry
+            and "file_mtime_ns" in entry
+            and entry.get("hash_algo", "sha256") == self.hash_algo
+        }
+        # Write-behind state: entries recorded but not yet saved, and whether
+        # each record() saves immediately (disabled inside batch() or a with block)
+        self._dirty = False
+        self._autoflush = True
+        # batch() blocks entered through ``with manifest:``, innermost last
+        self._batch_cms: list[AbstractContextManager[DataManifest]] = []
+        _open_manifests.add(self)
+
+    def __enter__(self) -> "DataManifest":
+        """Defer saves until exit; same as entering batch()."""
+        batch_cm = self.batch()
+        batch_cm.__enter__()
+        self._batch_cms.append(batch_cm)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Leave the batch entered by __enter__, saving if it was the outermost."""
+        self._batch_cms.pop().__exit__(*exc_info)
 
     def _load(self) -> dict[str, Any]:
         """Load manifest from disk or create empty."""
-        if self.manifest_path.exists():
-            with open(self.manifest_path) as f:
-                return yaml.safe_load(f) or {"files": {}}
-        return {"files": {}}
+        if not self.manifest_path.exists():
+            return {"files": {}}
+        raw = self.manifest_path.read_bytes()
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # Manifests written before the switch to JSON are block-style YAML
+            import yaml
+
+            # libyaml-backed loader when PyYAML was built with it
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            data = yaml.load(raw, Loader=loader)
+        data = data or {}
+        # Entry lookups index "files" directly, so it always exists
+        data.setdefault("files", {})
+        return data
 
     def _save(self) -> None:
-        """Save manifest to disk."""
+        """Save manifest to disk as indented JSON (which is also valid YAML).
+
+        The whole document goes to a temporary sibling in one write, is synced
+        and then renamed over the manifest, so readers never see a partial file.
+        """
         self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.manifest_path, "w") as f:
-            yaml.dump(self._data, f, default_flow_style=False, sort_keys=False)
+        payload = orjson.dumps(self._data, option=orjson.OPT_INDENT_2)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp_path, "wb", buffering=0) as f:
+            f.write(payload)
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.manifest_path)
+
+    def export_yaml(self, path: Path) -> Path:
+        """Write a block-style YAML copy of the manifest for human inspection.
+
+        Args:
+            path: Destination file
+
+        Returns:
+            Path to the written file
+        """
+        import yaml
+
+        # libyaml-backed dumper when PyYAML was built with it
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            yaml.dump(self._data, f, Dumper=dumper, default_flow_style=False, sort_keys=False)
+        return path
+
+    def flush(self) -> None:
+        """Save pending manifest entries to disk, if any."""
+        if self._dirty:
+            self._save()
+            self._dirty = False
+
+    @contextmanager
+    def batch(self) -> Iterator["DataManifest"]:
+        """Defer manifest saves until the end of the block.
+
+        Every record() inside the block updates the in-memory manifest only;
+        the file is rewritten once on exit (also when the block raises).
+
+        Example:
+            >>> with manifest.batch():
+            ...     for key, path in downloads:
+            ...         manifest.record(key, url, path)
+        """
+        previous = self._autoflush
+        self._autoflush = False
+        try:
+            yield self
+        finally:
+            self._autoflush = previous
+            if previous:
+                self.flush()
 
     def record(
         self,
@@ -49,39 +191,142 @@ class DataManifest:
         source_url: str,
         file_path: Path,
         notes: str = "",
+        file_hash: str | None = None,
     ) -> None:
         """Record a downloaded file in the manifest.
 
+        The manifest is saved right away, unless called inside batch() or a
+        ``with manifest:`` block, where saving waits for the block to exit.
+
         Args:
             file_key: Unique identifier for this file entry
             source_url: URL the file was downloaded from
             file_path: Local path to the downloaded file
             notes: Optional notes about the file
+            file_hash: Digest of the file in hash_algo if already known (e.g.
+                computed while streaming the download); skips reading the file back
+
+        A missing file is recorded without size/mtime (and with hash "N/A" when
+        no file_hash is given) rather than raising.
         """
-        file_hash = self._compute_hash(file_path) if file_path.exists() else "N/A"
+        if file_hash is not None:
+            stat = _stat_or_none(file_path)
+        else:
+            file_hash, stat = self._hash_file(file_key, file_path)
+        self._write_entry(file_key, source_url, file_path, file_hash, stat, notes)
+
+    def record_many(
+        self,
+        entries: list[tuple[str, str, Path, str]],
+        contents: list[bytes] | None = None,
+    ) -> None:
+        """Record several files, hashing them concurrently.
+
+        hashlib releases the GIL while digesting, so a thread pool overlaps
+        the reads and hashing of different files. The manifest is saved once.
+
+        Args:
+            entries: (file_key, source_url, file_path, notes) tuples
+            contents: Exact bytes of each entry's file, if already in memory. They
+                are hashed instead of reading the files back.
+        """
+        if not entries:
+            return
+
+        def digest(i: int) -> tuple[str, os.stat_result | None]:
+            file_key, _, file_path, _ = entries[i]
+            if contents is None:
+                return self._hash_file(file_key, file_path)
+            return self.hash_bytes(contents[i]), _stat_or_none(file_path)
+
+        workers = min(8, os.cpu_count() or 1, len(entries))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            hashed = list(pool.map(digest, range(len(entries))))
+
+        with self.batch():
+            for (file_key, source_url, file_path, notes), (file_hash, stat) in zip(
+                entries, hashed, strict=True
+            ):
+                self._write_entry(file_key, source_url, file_path, file_hash, stat, notes)
+
+    def hash_bytes(self, content: bytes) -> str:
+        """Hex digest of in-memory content in the manifest's hash algorithm."""
+        return hashlib.new(self.hash_algo, content).hexdigest()
+
+    def _hash_file(self, file_key: str, file_path: Path) -> tuple[str, os.stat_result | None]:
+        """Hash a file, reusing the recorded hash if its size and mtime are unchanged."""
+        stat = _stat_or_none(file_path)
+        if stat is None:
+            return "N/A", None
+
+        cached = self._hash_cache.get(file_key)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2], stat
+        return self._compute_hash(file_path, self.hash_algo), stat
+
+    def _write_entry(
+        self,
+        file_key: str,
+        source_url: str,
+        file_path: Path,
+        file_hash: str,
+        stat: os.stat_result | None,
+        notes: str,
+    ) -> None:
+        """Store a manifest entry and persist the manifest.
 
-        self._data["files"][file_key] = {
+        Re-recording a file with the same identity (source, hash, algorithm, path
+        and notes) keeps the original download time and does not mark the
+        manifest dirty; only the in-memory size/mtime are refreshed, since
+        rewriting identical bytes still changes the file's mtime.
+        """
+        entry = {
             "source_url": source_url,
             "download_timestamp": datetime.now(UTC).isoformat(),
             "file_hash": file_hash,
+            "hash_algo": self.hash_algo,
             "local_path": str(file_path),
             "notes": notes,
         }
-        self._save()
+        if stat is not None:
+            entry["file_size"] = stat.st_size
+            entry["file_mtime_ns"] = stat.st_mtime_ns
+            self._hash_cache[file_key] = (stat.st_size, stat.st_mtime_ns, file_hash)
+        else:
+            self._hash_cache.pop(file_key, None)
+
+        existing = self._data["files"].get(file_key)
+        if existing is not None and all(
+            existing.get(field) == entry[field] for field in _ENTRY_IDENTITY_FIELDS
+        ):
+            if stat is not None:
+                existing["file_size"] = stat.st_size
+                existing["file_mtime_ns"] = stat.st_mtime_ns
+            logger.debug(f"Manifest: {file_key} unchanged")
+            return
+
+        self._data["files"][file_key] = entry
+        self._dirty = True
+        if self._autoflush:
+            self.flush()
         logger.info(f"Manifest: recorded {file_key}")
 
     def get_entry(self, file_key: str) -> dict[str, Any] | None:
         """Get manifest entry for a file key."""
-        return self._data.get("files", {}).get(file_key)
+        return self._data["files"].get(file_key)
 
     def has_entry(self, file_key: str) -> bool:
         """Check if file key exists in manifest."""
-        return file_key in self._data.get("files", {})
+        return file_key in self._data["files"]
 
     @staticmethod
     def _compute_hash(file_path: Path, algorithm: str = "sha256") -> str:
         """Compute hash of a file.
 
+        The file is streamed through one preallocated 1 MiB buffer with readinto,
+        so no per-chunk bytes objects are allocated; it is opened unbuffered so
+        reads go straight into that buffer. hashlib releases the GIL on update.
+
         Args:
             file_path: Path to file
             algorithm: Hash algorithm (default: sha256)
@@ -90,9 +335,11 @@ class DataManifest:
             Hex digest of file hash
         """
         hasher = hashlib.new(algorithm)
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(8192), b""):
-                hasher.update(chunk)
+        buffer = bytearray(_HASH_CHUNK_SIZE)
+        view = memoryview(buffer)
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(buffer):
+                hasher.update(view[:n])
         return hasher.hexdigest()
 
 
@@ -125,9 +372,7 @@ class CacheManager:
         Returns:
             Path to cached file
         """
-        # Sanitize key for filesystem
-        safe_key = key.replace("/", "_").replace(":", "_").replace("?", "_")
-        return self.cache_dir / safe_key
+        return self.cache_dir / _safe_key(key)
 
     def has_cached(self, key: str) -> bool:
         """Check if a fresh cached file exists.
@@ -138,7 +383,29 @@ class CacheManager:
         Returns:
             True if cached file exists
         """
-        return self.get_cache_path(key).exists()
+        cache_path = self.get_cache_path(key)
+        return cache_path.exists() or _zst_path(cache_path).exists()
+
+    def cached_keys(self) -> frozenset[str]:
+        """Names of all files in the cache directory, from a single scandir pass.
+
+        These are sanitized filenames (see get_cache_path), including the
+        ``.zst`` suffix of compressed entries.
+        """
+        with os.scandir(self.cache_dir) as entries:
+            return frozenset(entry.name for entry in entries)
+
+    def has_many_cached(self, keys: list[str]) -> dict[str, bool]:
+        """Check which of many keys are cached with one directory scan.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of each key to whether a cached file exists
+        """
+        names = self.cached_keys()
+        return {key: (name := _safe_key(key)) in names or f"{name}.zst" in names for key in keys}
 
     def store(
         self,
@@ -156,22 +423,46 @@ class CacheManager:
             notes: Optional notes for manifest
 
         Returns:
-            Path to cached file
+            Path to cached file (with a ``.zst`` suffix if stored compressed)
         """
-        cache_path = self.get_cache_path(key)
-
-        # Write content
         if isinstance(content, str):
-            cache_path.write_text(content)
-        else:
-            cache_path.write_bytes(content)
-
-        # Record in manifest
-        self.manifest.record(key, source_url, cache_path, notes)
+            content = content.encode()
+        cache_path, payload = self._write(key, content)
+        # Hash the bytes actually written (compressed if stored as .zst) from
+        # memory, so the manifest never reads the file back and its hash always
+        # matches local_path
+        file_hash = self.manifest.hash_bytes(payload)
+
+        self.manifest.record(key, source_url, cache_path, notes, file_hash=file_hash)
         logger.info(f"Cached: {key} -> {cache_path}")
 
         return cache_path
 
+    def store_many(self, items: list[tuple[str, bytes | str, str, str]]) -> list[Path]:
+        """Store several contents in cache and record them in one manifest save.
+
+        Args:
+            items: (key, content, source_url, notes) tuples
+
+        Returns:
+            Paths to cached files, in input order
+        """
+        paths = []
+        entries = []
+        payloads = []
+        for key, content, source_url, notes in items:
+            if isinstance(content, str):
+                content = content.encode()
+            cache_path, payload = self._write(key, content)
+            paths.append(cache_path)
+            entries.append((key, source_url, cache_path, notes))
+            payloads.append(payload)
+
+        self.manifest.record_many(entries, payloads)
+        logger.info(f"Cached {len(paths)} files in {self.cache_dir}")
+
+        return paths
+
     def load_text(self, key: str) -> str | None:
         """Load cached text content.
 
@@ -182,9 +473,41 @@ class CacheManager:
             Cached text content or None if not cached
         """
         cache_path = self.get_cache_path(key)
-        if cache_path.exists():
+        try:
             return cache_path.read_text()
-        return None
+        except FileNotFoundError:
+            data = _read_zst(cache_path)
+        if data is None:
+            return None
+        # Same universal-newline handling as read_text
+        return io.StringIO(data.decode(), newline=None).read()
+
+    def load_json(self, key: str) -> Any | None:
+        """Load and parse cached JSON content.
+
+        Bytes go straight to orjson without decoding to ``str`` first; large
+        files are parsed from a read-only memory map instead of being copied.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Parsed JSON or None if not cached (or the cached file is empty)
+        """
+        cache_path = self.get_cache_path(key)
+        try:
+            f = open(cache_path, "rb")
+        except FileNotFoundError:
+            data = _read_zst(cache_path)
+            return orjson.loads(data) if data else None
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return None
+            if size < _MMAP_THRESHOLD:
+                return orjson.loads(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
 
     def load_bytes(self, key: str) -> bytes | None:
         """Load cached binary content.
@@ -196,6 +519,126 @@ class CacheManager:
             Cached bytes or None if not cached
         """
         cache_path = self.get_cache_path(key)
-        if cache_path.exists():
+        try:
             return cache_path.read_bytes()
+        except FileNotFoundError:
+            return _read_zst(cache_path)
+
+    def load_mmap(self, key: str) -> memoryview | None:
+        """Load cached binary content as a read-only view without copying it.
+
+        Uncompressed files are memory-mapped, so the view reads straight from
+        the page cache; the mapping stays open for as long as the view (or any
+        slice of it) is referenced. Cache writes replace files rather than
+        rewriting them in place, so a view keeps showing the version it mapped
+        even if the key is stored again. Compressed entries are decompressed
+        into memory first.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Read-only memoryview of the cached bytes or None if not cached
+        """
+        cache_path = self.get_cache_path(key)
+        try:
+            f = open(cache_path, "rb")
+        except FileNotFoundError:
+            data = _read_zst(cache_path)
+            return None if data is None else memoryview(data)
+        with f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return memoryview(b"")  # Empty files cannot be mapped
+            return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def _write(self, key: str, content: bytes) -> tuple[Path, bytes]:
+        """Write content for a key, zstd-compressing large payloads.
+
+        Payloads above COMPRESS_THRESHOLD go to a ``.zst`` sibling of the
+        cache path; whichever variant is not written is removed so loads never
+        see a stale copy.
+
+        Returns:
+            Path written and the exact bytes written to it
+        """
+        cache_path = self.get_cache_path(key)
+        compressed_path = _zst_path(cache_path)
+        if len(content) > COMPRESS_THRESHOLD:
+            payload = zstandard.ZstdCompressor(level=3).compress(content)
+            _write_file(compressed_path, payload)
+            cache_path.unlink(missing_ok=True)
+            return compressed_path, payload
+        _write_file(cache_path, content)
+        compressed_path.unlink(missing_ok=True)
+        return cache_path, content
+
+
+# Manifests that may hold unsaved entries at interpreter exit
+_open_manifests: "weakref.WeakSet[DataManifest]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_manifests() -> None:
+    for manifest in list(_open_manifests):
+        manifest.flush()
+
+
+@lru_cache(maxsize=4096)
+def _safe_key(key: str) -> str:
+    """Sanitize a cache key for use as a filename."""
+    safe = key.translate(_KEY_TRANS)
+    if len(safe) <= _MAX_KEY_LENGTH:
+        return safe
+    digest = hashlib.blake2b(key.encode(), digest_size=4).hexdigest()
+    return f"{safe[:_MAX_KEY_LENGTH]}_{digest}"
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    """Write data to path atomically with unbuffered os.write calls.
+
+    The bytes go straight from the caller's buffer to a temporary sibling,
+    normally in a single write, and the sibling is renamed over path. Readers
+    never see a partial file, and memory maps of the previous version (see
+    CacheManager.load_mmap) keep the old inode instead of being truncated
+    under them. Large payloads are preallocated so the filesystem can lay
+    them out contiguously.
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        try:
+            os.fchmod(fd, 0o644)
+            if len(data) > _PREALLOCATE_THRESHOLD and hasattr(os, "posix_fallocate"):
+                try:
+                    os.posix_fallocate(fd, 0, len(data))
+                except OSError:
+                    pass  # Filesystem without fallocate support; plain writes still work
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    """stat() of path, or None if it does not exist."""
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _zst_path(cache_path: Path) -> Path:
+    return cache_path.with_name(cache_path.name + ".zst")
+
+
+def _read_zst(cache_path: Path) -> bytes | None:
+    """Decompressed content of the ``.zst`` sibling of cache_path, or None if absent."""
+    try:
+        compressed = _zst_path(cache_path).read_bytes()
+    except FileNotFoundError:
         return None
+    return zstandard.ZstdDecompressor().decompress(compressed)
@@ -1,15 +1,31 @@
 """Polite HTTP client with rate limiting and retries."""
 
+import hashlib
 import logging
+import threading
 import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
 from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Every content coding urllib3 can decode here: gzip and deflate always, zstd
+# via zstandard, and br when brotli is installed (the "http" extra)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+
+# Headers every session starts with; the User-Agent is added per requester
+_DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType(
+    {"Accept": "application/json", "Accept-Encoding": ACCEPT_ENCODING}
+)
+
 
 class PoliteRequester:
     """HTTP client with rate limiting, retries, and proper headers.
@@ -26,18 +42,29 @@ class PoliteRequester:
         rate_limit: float = 0.1,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        burst: int = 1,
+        max_connections: int = 20,
     ):
         """Initialize polite requester.
 
         Args:
             user_agent: User-Agent header value (required by SEC)
-            rate_limit: Minimum seconds between requests
+            rate_limit: Minimum average seconds between requests (0 disables limiting)
             max_retries: Number of retry attempts on failure
             backoff_factor: Exponential backoff multiplier
+            burst: Requests that may start back-to-back before limiting applies
+            max_connections: Keep-alive connections pooled per host
         """
         self.user_agent = user_agent
         self.rate_limit = rate_limit
-        self._last_request_time: float = 0
+
+        # Token bucket refilled at 1 / rate_limit tokens per second. Callers
+        # reserve a token under the lock and sleep outside it, so concurrent
+        # threads are spaced out without serializing on the request itself.
+        self._bucket_capacity = float(max(burst, 1))
+        self._bucket_tokens = self._bucket_capacity
+        self._bucket_last = time.monotonic()
+        self._bucket_lock = threading.Lock()
 
         # Configure session with retries
         self.session = requests.Session()
@@ -47,24 +74,32 @@ class PoliteRequester:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET"],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Pool enough keep-alive connections that get_many workers reuse warm
+        # TLS sessions instead of opening and discarding overflow connections
+        adapter = HTTPAdapter(pool_maxsize=max_connections, max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
         # Set default headers
-        self.session.headers.update(
-            {
-                "User-Agent": self.user_agent,
-                "Accept": "application/json",
-                "Accept-Encoding": "gzip, deflate",
-            }
-        )
+        self.session.headers.update(_DEFAULT_HEADERS)
+        self.session.headers["User-Agent"] = self.user_agent
 
     def _wait_for_rate_limit(self) -> None:
-        """Wait if needed to respect rate limit."""
-        elapsed = time.time() - self._last_request_time
-        if elapsed < self.rate_limit:
-            sleep_time = self.rate_limit - elapsed
+        """Take a token from the bucket, sleeping only if none is available."""
+        if self.rate_limit <= 0:
+            return
+        rate = 1.0 / self.rate_limit
+        with self._bucket_lock:
+            now = time.monotonic()
+            tokens = min(
+                self._bucket_capacity,
+                self._bucket_tokens + (now - self._bucket_last) * rate,
+            )
+            # Going negative reserves a future slot for this caller
+            self._bucket_tokens = tokens - 1
+            self._bucket_last = now
+        if tokens < 1:
+            sleep_time = (1 - tokens) / rate
             logger.debug(f"Rate limiting: sleeping {sleep_time:.3f}s")
             time.sleep(sleep_time)
 
@@ -84,12 +119,77 @@ class PoliteRequester:
         self._wait_for_rate_limit()
         logger.debug(f"GET {url}")
 
+        response = self.session.get(url, timeout=30, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def get_to_file(
+        self,
+        url: str,
+        path: Path,
+        chunk_size: int = 256 * 1024,
+        hash_algo: str = "sha256",
+        **kwargs: Any,
+    ) -> str:
+        """Make rate-limited GET request and stream the body to a file.
+
+        The body is written in chunks while being hashed, so it is never held
+        in memory as a whole and never has to be read back to compute its hash.
+        The file only appears at ``path`` once the download has completed; on
+        failure the partial file is removed.
+
+        Args:
+            url: Target URL
+            path: Destination file
+            chunk_size: Bytes per read from the response stream
+            hash_algo: hashlib algorithm for the digest
+            **kwargs: Additional arguments passed to requests.get
+
+        Returns:
+            Hex digest of the written file
+        """
+        self._wait_for_rate_limit()
+        logger.debug(f"GET {url} -> {path}")
+
+        hasher = hashlib.new(hash_algo)
+        partial = path.with_name(path.name + ".part")
         try:
-            response = self.session.get(url, timeout=30, **kwargs)
-            response.raise_for_status()
-            return response
-        finally:
-            self._last_request_time = time.time()
+            with self.session.get(url, timeout=30, stream=True, **kwargs) as response:
+                response.raise_for_status()
+                with open(partial, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=chunk_size):
+                        hasher.update(chunk)
+                        f.write(chunk)
+            partial.replace(path)
+        except BaseException:
+            # Never leave a half-written download behind
+            partial.unlink(missing_ok=True)
+            raise
+        return hasher.hexdigest()
+
+    def get_many(
+        self, urls: list[str], max_workers: int = 4, **kwargs: Any
+    ) -> list[requests.Response]:
+        """Make rate-limited GET requests concurrently.
+
+        Requests overlap on the network while still drawing from the shared
+        token bucket, so the overall request rate limit holds.
+
+        Args:
+            urls: Target URLs
+            max_workers: Maximum number of requests in flight
+            **kwargs: Additional arguments passed to requests.get
+
+        Returns:
+            Responses in the same order as urls
+
+        Raises:
+            requests.RequestException: If any request fails after retries
+        """
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as pool:
+            return list(pool.map(lambda url: self.get(url, **kwargs), urls))
 
     def get_json(self, url: str, **kwargs: Any) -> dict[str, Any]:
         """Make rate-limited GET request and parse JSON response.
@@ -3,10 +3,16 @@
 import os
 import tempfile
 from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
 
+import numpy as np
+import orjson
+import pandas as pd
 import pytest
+import responses
 
 from banklab.config import Config
+from banklab.utils.cache import CacheManager, DataManifest
 
 
 @pytest.fixture
@@ -16,6 +22,13 @@ def temp_data_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture
+def manifest_and_cache(temp_data_dir):
+    """Fresh DataManifest and CacheManager rooted in the temp data directory."""
+    manifest = DataManifest(temp_data_dir / "manifest.yml")
+    return manifest, CacheManager(temp_data_dir / "cache", manifest)
+
+
 @pytest.fixture
 def test_config(temp_data_dir):
     """Create a test configuration with temp directories."""
@@ -26,12 +39,94 @@ def test_config(temp_data_dir):
     return config
 
 
+@pytest.fixture(scope="module")
+def requester():
+    """PoliteRequester (and its HTTP session) for read-only checks across a test module."""
+    from banklab.utils.http import PoliteRequester
+
+    return PoliteRequester(user_agent="Test Agent")
+
+
+@pytest.fixture(scope="session")
+def session_test_config(tmp_path_factory):
+    """Test configuration whose temp directories are shared by the whole session."""
+    config = Config()
+    config.data_dir = tmp_path_factory.mktemp("data")
+    config.tickers = ["JPM", "MS"]
+    config.ensure_dirs()
+    return config
+
+
+@pytest.fixture(scope="module")
+def module_test_config(tmp_path_factory):
+    """Test configuration shared by the tests of one module."""
+    config = Config()
+    config.data_dir = tmp_path_factory.mktemp("data")
+    config.tickers = ["JPM", "MS"]
+    config.fred_api_key = "test_api_key_12345"
+    config.ensure_dirs()
+    return config
+
+
+@pytest.fixture(scope="module")
+def market_loader(module_test_config):
+    """MarketLoader (and its HTTP session) reused across a test module."""
+    from banklab.ingest.market import MarketLoader
+
+    return MarketLoader(module_test_config)
+
+
+@pytest.fixture(scope="module")
+def macro_loader(module_test_config):
+    """MacroLoader (and its HTTP session) reused across a test module."""
+    from banklab.ingest.macro import MacroLoader
+
+    return MacroLoader(module_test_config)
+
+
+@pytest.fixture(scope="session")
+def factors_df(session_test_config):
+    """Fama-French factors downloaded once per test session."""
+    from banklab.ingest.factors import FactorsLoader
+
+    return FactorsLoader(session_test_config).download_factors()
+
+
 @pytest.fixture
 def mock_fred_api_key(monkeypatch):
     """Set a mock FRED API key for testing."""
     monkeypatch.setenv("FRED_API_KEY", "test_api_key_12345")
 
 
+@pytest.fixture
+def fred_responses():
+    """Serve canned FRED observations so macro loader tests run offline."""
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add_callback(
+            responses.GET,
+            "https://api.stlouisfed.org/fred/series/observations",
+            callback=_fred_observations,
+            content_type="application/json",
+        )
+        yield rsps
+
+
+@pytest.fixture
+def stooq_responses():
+    """Serve canned Stooq daily price CSVs so market loader tests run offline."""
+    with _stooq_mock() as rsps:
+        yield rsps
+
+
+@pytest.fixture(scope="session")
+def jpm_ms_prices(session_test_config):
+    """JPM and MS daily prices with returns, loaded once per test session."""
+    from banklab.ingest.market import MarketLoader
+
+    with _stooq_mock():
+        return MarketLoader(session_test_config).load_all_tickers(["JPM", "MS"])
+
+
 # Skip network tests if running in CI without network
 def pytest_configure(config):
     """Add custom markers."""
@@ -45,3 +140,41 @@ def pytest_collection_modifyitems(config, items):
         for item in items:
             if "network" in item.keywords:
                 item.add_marker(skip_network)
+
+
+def _fred_observations(request):
+    """Build a FRED observations payload: 90 business days with one missing value."""
+    series_id = parse_qs(urlsplit(request.url).query)["series_id"][0]
+    rng = np.random.default_rng(sum(map(ord, series_id)))
+    dates = pd.bdate_range("2024-01-01", periods=90)
+    values = np.round(5 + rng.normal(0, 0.05, len(dates)).cumsum(), 2)
+    observations = [
+        {"date": d.strftime("%Y-%m-%d"), "value": f"{v:.2f}"}
+        for d, v in zip(dates, values, strict=True)
+    ]
+    observations[10]["value"] = "."  # FRED's missing value marker
+    return 200, {}, orjson.dumps({"observations": observations})
+
+
+def _stooq_mock():
+    """RequestsMock answering Stooq price CSV requests."""
+    rsps = responses.RequestsMock(assert_all_requests_are_fired=False)
+    rsps.add_callback(
+        responses.GET,
+        "https://stooq.com/q/d/l/",
+        callback=_stooq_prices,
+        content_type="text/csv",
+    )
+    return rsps
+
+
+def _stooq_prices(request):
+    """Build a Stooq daily CSV (newest first) for the requested ticker."""
+    ticker = parse_qs(urlsplit(request.url).query)["s"][0]
+    rng = np.random.default_rng(sum(map(ord, ticker)))
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    close = 100 * np.exp(rng.normal(0, 0.01, len(dates)).cumsum())
+    rows = ["Date,Open,High,Low,Close,Volume"]
+    for d, c in zip(dates[::-1], close[::-1], strict=True):
+        rows.append(f"{d:%Y-%m-%d},{c:.2f},{c * 1.01:.2f},{c * 0.99:.2f},{c:.2f},1000000")
+    return 200, {}, "\n".join(rows) + "\n"
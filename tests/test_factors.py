@@ -1,5 +1,8 @@
 """Tests for Fama-French factors loader."""
 
+import io
+import zipfile
+
 import pandas as pd
 import pytest
 
@@ -10,10 +13,9 @@ class TestFactorsLoader:
     """Tests for FactorsLoader functionality."""
 
     @pytest.mark.network
-    def test_download_factors_returns_data(self, test_config):
+    def test_download_factors_returns_data(self, factors_df):
         """Test that factor download returns valid DataFrame."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         # Should be non-empty
         assert len(df) > 0
@@ -22,38 +24,34 @@ class TestFactorsLoader:
         assert len(df) > 1000  # ~4 years of daily data minimum
 
     @pytest.mark.network
-    def test_download_factors_columns(self, test_config):
+    def test_download_factors_columns(self, factors_df):
         """Test that factors DataFrame has correct columns."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         expected_cols = ["date", "mktrf", "smb", "hml", "rmw", "cma", "rf"]
         assert list(df.columns) == expected_cols
 
     @pytest.mark.network
-    def test_download_factors_date_type(self, test_config):
+    def test_download_factors_date_type(self, factors_df):
         """Test that date column is datetime type."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         assert pd.api.types.is_datetime64_any_dtype(df["date"])
         assert df["date"].notna().all()
 
     @pytest.mark.network
-    def test_download_factors_date_monotonicity(self, test_config):
+    def test_download_factors_date_monotonicity(self, factors_df):
         """Test that factors are sorted by date ascending."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         # Dates should be monotonically increasing
         dates = df["date"].tolist()
         assert dates == sorted(dates)
 
     @pytest.mark.network
-    def test_factors_are_decimals(self, test_config):
+    def test_factors_are_decimals(self, factors_df):
         """Test that factor returns are in decimal form (not percent)."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         factor_cols = ["mktrf", "smb", "hml", "rmw", "cma", "rf"]
 
@@ -66,10 +64,9 @@ class TestFactorsLoader:
             assert df[col].abs().mean() < 0.1
 
     @pytest.mark.network
-    def test_factors_no_missing_values(self, test_config):
+    def test_factors_no_missing_values(self, factors_df):
         """Test that factors don't have excessive missing values."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         factor_cols = ["mktrf", "smb", "hml", "rmw", "cma", "rf"]
 
@@ -79,21 +76,19 @@ class TestFactorsLoader:
             assert missing_pct < 0.01, f"{col} has {missing_pct:.1%} missing values"
 
     @pytest.mark.network
-    def test_to_parquet_schema(self, test_config):
+    def test_to_parquet_schema(self, test_config, factors_df):
         """Test conversion to final parquet schema."""
         loader = FactorsLoader(test_config)
-        raw = loader.download_factors()
-        output = loader.to_parquet_schema(raw)
+        output = loader.to_parquet_schema(factors_df)
 
         # Should have correct columns
         expected_cols = ["date", "mktrf", "smb", "hml", "rmw", "cma", "rf"]
         assert list(output.columns) == expected_cols
 
     @pytest.mark.network
-    def test_factors_date_range_reasonable(self, test_config):
+    def test_factors_date_range_reasonable(self, factors_df):
         """Test that data covers reasonable date range."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         # Should have data starting before 2000
         min_date = df["date"].min()
@@ -104,10 +99,9 @@ class TestFactorsLoader:
         assert max_date.year >= 2024
 
     @pytest.mark.network
-    def test_rf_rate_reasonable(self, test_config):
+    def test_rf_rate_reasonable(self, factors_df):
         """Test that risk-free rate values are reasonable."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         # RF should be non-negative (mostly)
         # Allow small negative due to data issues but not extremely negative
@@ -117,10 +111,9 @@ class TestFactorsLoader:
         assert df["rf"].max() < 0.001  # 0.1% daily = ~36% annual
 
     @pytest.mark.network
-    def test_unique_dates(self, test_config):
+    def test_unique_dates(self, factors_df):
         """Test that each date appears only once."""
-        loader = FactorsLoader(test_config)
-        df = loader.download_factors()
+        df = factors_df
 
         assert df["date"].is_unique
 
@@ -137,3 +130,21 @@ class TestFactorsLoader:
 
         # Should return same data
         pd.testing.assert_frame_equal(df1, df2)
+
+    def test_loads_compressed_cache_entry(self, test_config, monkeypatch):
+        """Test that a cached ZIP stored as a .zst sibling loads without a download."""
+        monkeypatch.setattr("banklab.utils.cache.COMPRESS_THRESHOLD", 0)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr(
+                "F-F_Research_Data_5_Factors_2x3_daily.CSV",
+                "header\n,Mkt-RF,SMB,HML,RMW,CMA,RF\n20240102,1.0,0.5,-0.2,0.1,0.0,0.02\n",
+            )
+        loader = FactorsLoader(test_config)
+        path = loader.cache.store("ff5_daily.zip", buffer.getvalue(), "http://example.com")
+
+        df = loader.download_factors()
+
+        assert path.name == "ff5_daily.zip.zst"
+        assert len(df) == 1
+        assert df["mktrf"].iloc[0] == pytest.approx(0.01)
@@ -0,0 +1,35 @@
+"""Tests for file I/O helpers."""
+
+import pandas as pd
+
+from banklab.io import read_parquet
+
+
+class TestReadParquet:
+    """Tests for column-projected parquet reads."""
+
+    def test_reads_requested_columns_only(self, temp_data_dir):
+        """Test that only the requested columns come back, in the requested order."""
+        path = temp_data_dir / "prices.parquet"
+        pd.DataFrame(
+            {
+                "date": pd.date_range("2024-01-01", periods=3),
+                "ticker": ["JPM", "MS", "JPM"],
+                "close": [1.0, 2.0, 3.0],
+            }
+        ).to_parquet(path, index=False)
+
+        df = read_parquet(path, columns=["ticker", "date"])
+
+        assert list(df.columns) == ["ticker", "date"]
+        assert len(df) == 3
+
+    def test_matches_pandas_reader(self, temp_data_dir):
+        """Test that a full read round-trips like pd.read_parquet, categoricals included."""
+        path = temp_data_dir / "kpis.parquet"
+        original = pd.DataFrame(
+            {"kpi_name": pd.Categorical(["roe", "roa", "roe"]), "value": [0.1, 0.01, 0.12]}
+        )
+        original.to_parquet(path, index=False)
+
+        pd.testing.assert_frame_equal(read_parquet(path), pd.read_parquet(path))
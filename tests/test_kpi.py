@@ -4,6 +4,8 @@ These tests use small toy dataframes to verify KPI calculations are correct.
 All tests are deterministic and don't require network access.
 """
 
+import math
+
 import numpy as np
 import pandas as pd
 import pytest
@@ -30,6 +32,49 @@ from banklab.kpi.kpi import (
 )
 
 
+def _close(actual, expected, tol=1e-9):
+    """Assert two floats agree to within a tight relative/absolute tolerance."""
+    assert math.isclose(actual, expected, rel_tol=tol, abs_tol=tol), f"{actual} != {expected}"
+
+
+# (function, positional args, keyword args) that must produce NaN
+BAD_INPUTS = [
+    pytest.param(return_on_equity, (5_000_000, 0), {"annualize": False}, id="roe_zero_equity"),
+    pytest.param(efficiency_ratio, (6_000_000, 0), {}, id="efficiency_zero_revenue"),
+    pytest.param(earnings_per_share, (10_000_000, 0), {}, id="eps_zero_shares"),
+    pytest.param(yoy_growth, (100, 0), {}, id="yoy_zero_prior"),
+    pytest.param(return_on_equity, (None, 50_000_000), {"annualize": False}, id="roe_none_income"),
+    pytest.param(return_on_equity, (5_000_000, None), {"annualize": False}, id="roe_none_equity"),
+    pytest.param(efficiency_ratio, (None, 10_000_000), {}, id="efficiency_none_expense"),
+    pytest.param(return_on_equity, (np.nan, 50_000_000), {"annualize": False}, id="roe_nan_income"),
+    pytest.param(book_value_per_share, (np.nan, 1_000_000), {}, id="bvps_nan_equity"),
+]
+
+# A complete fundamentals row for the KPI aggregator
+_SAMPLE_FIELDS = [
+    ("ticker", "TEST"),
+    ("fiscal_year", 2024),
+    ("fiscal_period", "Q4"),
+    ("net_income", 5_000_000),
+    ("total_equity", 50_000_000),
+    ("total_assets", 500_000_000),
+    ("net_interest_income", 8_000_000),
+    ("noninterest_income", 4_000_000),
+    ("noninterest_expense", 6_000_000),
+    ("total_revenue", 12_000_000),
+    ("shares_outstanding", 1_000_000),
+    ("goodwill", 5_000_000),
+    ("intangible_assets", 2_000_000),
+    ("loans_net", 80_000_000),
+    ("total_deposits", 100_000_000),
+    ("allowance_for_loan_losses", 4_000_000),
+]
+_SAMPLE_ROW = pd.Series(
+    [value for _, value in _SAMPLE_FIELDS],
+    index=[name for name, _ in _SAMPLE_FIELDS],
+)
+
+
 class TestProfitabilityKPIs:
     """Tests for profitability metrics."""
 
@@ -40,7 +85,7 @@ class TestProfitabilityKPIs:
             total_equity=50_000_000,
             annualize=False,
         )
-        assert result == pytest.approx(0.10)
+        _close(result, 0.10)
 
     def test_roe_annualized(self):
         """Test annualized ROE."""
@@ -50,12 +95,7 @@ class TestProfitabilityKPIs:
             annualize=True,
             periods_per_year=4,
         )
-        assert result == pytest.approx(0.10)
-
-    def test_roe_zero_equity(self):
-        """Test ROE with zero equity returns NaN."""
-        result = return_on_equity(net_income=5_000_000, total_equity=0, annualize=False)
-        assert np.isnan(result)
+        _close(result, 0.10)
 
     def test_roe_negative_income(self):
         """Test ROE handles negative income."""
@@ -64,7 +104,7 @@ class TestProfitabilityKPIs:
             total_equity=50_000_000,
             annualize=False,
         )
-        assert result == pytest.approx(-0.10)
+        _close(result, -0.10)
 
     def test_roa_basic(self):
         """Test basic ROA calculation."""
@@ -73,7 +113,7 @@ class TestProfitabilityKPIs:
             total_assets=500_000_000,
             annualize=False,
         )
-        assert result == pytest.approx(0.01)
+        _close(result, 0.01)
 
     def test_roa_annualized(self):
         """Test annualized ROA."""
@@ -83,7 +123,7 @@ class TestProfitabilityKPIs:
             annualize=True,
             periods_per_year=4,
         )
-        assert result == pytest.approx(0.01)
+        _close(result, 0.01)
 
     def test_nim_basic(self):
         """Test net interest margin calculation."""
@@ -92,7 +132,7 @@ class TestProfitabilityKPIs:
             total_assets=400_000_000,
             annualize=False,
         )
-        assert result == pytest.approx(0.0075)
+        _close(result, 0.0075)
 
     def test_nim_annualized(self):
         """Test annualized NIM."""
@@ -102,7 +142,7 @@ class TestProfitabilityKPIs:
             annualize=True,
             periods_per_year=4,
         )
-        assert result == pytest.approx(0.03)
+        _close(result, 0.03)
 
     def test_efficiency_ratio_basic(self):
         """Test efficiency ratio calculation."""
@@ -110,12 +150,7 @@ class TestProfitabilityKPIs:
             noninterest_expense=6_000_000,
             total_revenue=10_000_000,
         )
-        assert result == pytest.approx(0.60)
-
-    def test_efficiency_ratio_zero_revenue(self):
-        """Test efficiency ratio with zero revenue."""
-        result = efficiency_ratio(noninterest_expense=6_000_000, total_revenue=0)
-        assert np.isnan(result)
+        _close(result, 0.60)
 
     def test_ppnr_basic(self):
         """Test PPNR calculation."""
@@ -136,12 +171,7 @@ class TestValuationKPIs:
             net_income=10_000_000,
             shares_outstanding=1_000_000,
         )
-        assert result == pytest.approx(10.0)
-
-    def test_eps_zero_shares(self):
-        """Test EPS with zero shares."""
-        result = earnings_per_share(net_income=10_000_000, shares_outstanding=0)
-        assert np.isnan(result)
+        _close(result, 10.0)
 
     def test_bvps_basic(self):
         """Test book value per share."""
@@ -149,7 +179,7 @@ class TestValuationKPIs:
             total_equity=50_000_000,
             shares_outstanding=1_000_000,
         )
-        assert result == pytest.approx(50.0)
+        _close(result, 50.0)
 
     def test_tbvps_basic(self):
         """Test tangible book value per share."""
@@ -159,7 +189,7 @@ class TestValuationKPIs:
             intangible_assets=2_000_000,
             shares_outstanding=1_000_000,
         )
-        assert result == pytest.approx(43.0)
+        _close(result, 43.0)
 
     def test_tbvps_no_intangibles(self):
         """Test TBVPS when intangibles are None/NaN."""
@@ -169,17 +199,17 @@ class TestValuationKPIs:
             intangible_assets=np.nan,
             shares_outstanding=1_000_000,
         )
-        assert result == pytest.approx(50.0)
+        _close(result, 50.0)
 
     def test_price_to_book(self):
         """Test P/B ratio."""
         result = price_to_book(stock_price=75.0, book_value_per_share=50.0)
-        assert result == pytest.approx(1.5)
+        _close(result, 1.5)
 
     def test_price_to_earnings(self):
         """Test P/E ratio."""
         result = price_to_earnings(stock_price=100.0, eps_ttm=10.0)
-        assert result == pytest.approx(10.0)
+        _close(result, 10.0)
 
 
 class TestCapitalKPIs:
@@ -191,7 +221,7 @@ class TestCapitalKPIs:
             total_equity=50_000_000,
             total_assets=500_000_000,
         )
-        assert result == pytest.approx(0.10)
+        _close(result, 0.10)
 
     def test_tangible_equity_ratio(self):
         """Test TCE ratio calculation."""
@@ -202,7 +232,7 @@ class TestCapitalKPIs:
             total_assets=500_000_000,
         )
         expected = (50 - 5 - 2) / (500 - 5 - 2)
-        assert result == pytest.approx(expected)
+        _close(result, expected)
 
     def test_leverage_ratio(self):
         """Test leverage multiple."""
@@ -210,7 +240,7 @@ class TestCapitalKPIs:
             total_assets=500_000_000,
             total_equity=50_000_000,
         )
-        assert result == pytest.approx(10.0)
+        _close(result, 10.0)
 
 
 class TestAssetQualityKPIs:
@@ -222,7 +252,7 @@ class TestAssetQualityKPIs:
             allowance_for_loan_losses=5_000_000,
             loans_net=95_000_000,
         )
-        assert result == pytest.approx(0.05)
+        _close(result, 0.05)
 
     def test_loan_to_deposit(self):
         """Test loan-to-deposit ratio."""
@@ -230,7 +260,7 @@ class TestAssetQualityKPIs:
             loans_net=80_000_000,
             total_deposits=100_000_000,
         )
-        assert result == pytest.approx(0.80)
+        _close(result, 0.80)
 
 
 class TestGrowthKPIs:
@@ -239,37 +269,26 @@ class TestGrowthKPIs:
     def test_yoy_growth_positive(self):
         """Test YoY growth - positive case."""
         result = yoy_growth(current_value=110, prior_year_value=100)
-        assert result == pytest.approx(0.10)
+        _close(result, 0.10)
 
     def test_yoy_growth_negative(self):
         """Test YoY growth - decline."""
         result = yoy_growth(current_value=90, prior_year_value=100)
-        assert result == pytest.approx(-0.10)
-
-    def test_yoy_growth_zero_prior(self):
-        """Test YoY growth with zero prior value."""
-        result = yoy_growth(current_value=100, prior_year_value=0)
-        assert np.isnan(result)
+        _close(result, -0.10)
 
     def test_qoq_growth(self):
         """Test QoQ growth."""
         result = qoq_growth(current_value=105, prior_quarter_value=100)
-        assert result == pytest.approx(0.05)
+        _close(result, 0.05)
 
 
 class TestEdgeCases:
     """Tests for edge cases and error handling."""
 
-    def test_none_inputs(self):
-        """Test that None inputs return NaN."""
-        assert np.isnan(return_on_equity(None, 50_000_000, annualize=False))
-        assert np.isnan(return_on_equity(5_000_000, None, annualize=False))
-        assert np.isnan(efficiency_ratio(None, 10_000_000))
-
-    def test_nan_inputs(self):
-        """Test that NaN inputs return NaN."""
-        assert np.isnan(return_on_equity(np.nan, 50_000_000, annualize=False))
-        assert np.isnan(book_value_per_share(np.nan, 1_000_000))
+    @pytest.mark.parametrize("fn,args,kwargs", BAD_INPUTS)
+    def test_invalid_inputs_return_nan(self, fn, args, kwargs):
+        """Test that zero denominators and None/NaN inputs return NaN."""
+        assert np.isnan(fn(*args, **kwargs))
 
     def test_mixed_valid_invalid(self):
         """Test functions handle mixed valid/invalid gracefully."""
@@ -279,7 +298,7 @@ class TestEdgeCases:
             intangible_assets=None,
             shares_outstanding=1_000_000,
         )
-        assert result == pytest.approx(50.0)
+        _close(result, 50.0)
 
 
 class TestCalculateAllKPIs:
@@ -287,28 +306,7 @@ class TestCalculateAllKPIs:
 
     def test_calculate_all_kpis_basic(self):
         """Test calculating all KPIs from a row."""
-        row = pd.Series(
-            {
-                "ticker": "TEST",
-                "fiscal_year": 2024,
-                "fiscal_period": "Q4",
-                "net_income": 5_000_000,
-                "total_equity": 50_000_000,
-                "total_assets": 500_000_000,
-                "net_interest_income": 8_000_000,
-                "noninterest_income": 4_000_000,
-                "noninterest_expense": 6_000_000,
-                "total_revenue": 12_000_000,
-                "shares_outstanding": 1_000_000,
-                "goodwill": 5_000_000,
-                "intangible_assets": 2_000_000,
-                "loans_net": 80_000_000,
-                "total_deposits": 100_000_000,
-                "allowance_for_loan_losses": 4_000_000,
-            }
-        )
-
-        kpis = calculate_all_kpis(row)
+        kpis = calculate_all_kpis(_SAMPLE_ROW)
 
         assert "roe" in kpis
         assert "roa" in kpis
@@ -317,9 +315,9 @@ class TestCalculateAllKPIs:
         assert "tbvps" in kpis
         assert "leverage" in kpis
 
-        assert kpis["eps"] == pytest.approx(5.0)
-        assert kpis["bvps"] == pytest.approx(50.0)
-        assert kpis["leverage"] == pytest.approx(10.0)
+        _close(kpis["eps"], 5.0)
+        _close(kpis["bvps"], 50.0)
+        _close(kpis["leverage"], 10.0)
 
     def test_calculate_all_kpis_missing_data(self):
         """Test KPI calculation with missing line items."""
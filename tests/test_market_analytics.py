@@ -16,18 +16,22 @@ from banklab.market.returns import (
     returns_to_quarterly,
 )
 
+_DATES_10 = pd.date_range("2020-01-01", periods=10, freq="D")
+_RNG = np.random.default_rng(42)
+_RETURNS_100 = _RNG.normal(0.001, 0.02, 100)
+_RETURNS_H1_2020 = _RNG.normal(0.001, 0.02, 182)  # one draw per day of 2020-01-01..06-30
+
 
 class TestComputeReturns:
     """Tests for return calculations."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_prices(self):
         """Create sample price data."""
-        dates = pd.date_range("2020-01-01", periods=10, freq="D")
         return pd.DataFrame(
             {
                 "ticker": ["TEST"] * 10,
-                "date": dates,
+                "date": _DATES_10,
                 "close": [100, 102, 101, 103, 105, 104, 106, 108, 107, 110],
             }
         )
@@ -62,17 +66,14 @@ class TestComputeReturns:
 class TestRollingVolatility:
     """Tests for volatility calculations."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_returns(self):
         """Create sample return data."""
-        np.random.seed(42)
-        dates = pd.date_range("2020-01-01", periods=100, freq="D")
-        returns = np.random.normal(0.001, 0.02, 100)
         return pd.DataFrame(
             {
                 "ticker": ["TEST"] * 100,
-                "date": dates,
-                "return": returns,
+                "date": pd.date_range("2020-01-01", periods=100, freq="D"),
+                "return": _RETURNS_100,
             }
         )
 
@@ -94,7 +95,7 @@ class TestRollingVolatility:
 class TestDrawdowns:
     """Tests for drawdown calculations."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_returns(self):
         """Create sample with known drawdown."""
         return pd.DataFrame(
@@ -131,17 +132,15 @@ class TestDrawdowns:
 class TestReturnsToQuarterly:
     """Tests for quarterly aggregation."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_daily_returns(self):
         """Create sample daily returns spanning quarters."""
         dates = pd.date_range("2020-01-01", "2020-06-30", freq="D")
-        np.random.seed(42)
-        returns = np.random.normal(0.001, 0.02, len(dates))
         return pd.DataFrame(
             {
                 "ticker": ["TEST"] * len(dates),
                 "date": dates,
-                "return": returns,
+                "return": _RETURNS_H1_2020,
             }
         )
 
@@ -161,18 +160,18 @@ class TestReturnsToQuarterly:
 class TestFactorModels:
     """Tests for factor model estimation."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def sample_data(self):
         """Create sample returns and factors."""
-        np.random.seed(42)
+        rng = np.random.default_rng(42)
         dates = pd.date_range("2020-01-01", periods=252, freq="D")
 
         # Market returns
-        mktrf = np.random.normal(0.0004, 0.01, 252)
+        mktrf = rng.normal(0.0004, 0.01, 252)
         rf = np.full(252, 0.0001)
 
         # Stock returns with beta = 1.2
-        stock_returns = 0.0001 + 1.2 * mktrf + np.random.normal(0, 0.005, 252)
+        stock_returns = 0.0001 + 1.2 * mktrf + rng.normal(0, 0.005, 252)
 
         returns = pd.DataFrame(
             {
@@ -187,19 +186,24 @@ class TestFactorModels:
                 "date": dates,
                 "mktrf": mktrf,
                 "rf": rf,
-                "smb": np.random.normal(0, 0.005, 252),
-                "hml": np.random.normal(0, 0.005, 252),
-                "rmw": np.random.normal(0, 0.005, 252),
-                "cma": np.random.normal(0, 0.005, 252),
+                "smb": rng.normal(0, 0.005, 252),
+                "hml": rng.normal(0, 0.005, 252),
+                "rmw": rng.normal(0, 0.005, 252),
+                "cma": rng.normal(0, 0.005, 252),
             }
         )
 
         return returns, factors
 
-    def test_capm_estimation(self, sample_data):
-        """Test CAPM estimation."""
+    @pytest.fixture(scope="class")
+    def capm_results(self, sample_data):
+        """Fit CAPM once for every test in the class."""
         returns, factors = sample_data
-        results = estimate_capm(returns, factors)
+        return estimate_capm(returns, factors)
+
+    def test_capm_estimation(self, capm_results):
+        """Test CAPM estimation."""
+        results = capm_results
 
         assert len(results) == 1
         result = results[0]
@@ -209,11 +213,9 @@ class TestFactorModels:
         assert 0.8 < result.betas["mktrf"] < 1.6  # Beta should be near 1.2
         assert result.r_squared > 0.5  # Good fit expected
 
-    def test_factor_results_to_dataframe(self, sample_data):
+    def test_factor_results_to_dataframe(self, capm_results):
         """Test conversion to DataFrame."""
-        returns, factors = sample_data
-        results = estimate_capm(returns, factors)
-        df = factor_results_to_dataframe(results)
+        df = factor_results_to_dataframe(capm_results)
 
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 1
@@ -0,0 +1,73 @@
+"""Tests for Stooq market price loader."""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from banklab.quality.checks import has_duplicates
+
+
+class TestMarketLoader:
+    """Tests for MarketLoader functionality against stubbed Stooq responses."""
+
+    def test_download_prices_returns_data(self, market_loader, stooq_responses):
+        """Test that price download returns valid DataFrame."""
+        df = market_loader.download_prices("JPM")
+
+        assert len(df) > 0
+        assert {"date", "close", "ticker"} <= set(df.columns)
+        assert (df["ticker"] == "JPM").all()
+
+    def test_download_prices_sorted(self, market_loader, stooq_responses):
+        """Test that prices are sorted by date ascending."""
+        df = market_loader.download_prices("JPM")
+
+        assert pd.api.types.is_datetime64_any_dtype(df["date"])
+        assert df["date"].is_monotonic_increasing
+
+    def test_caching_works(self, market_loader, stooq_responses):
+        """Test that the second download is served from the cache."""
+        first = market_loader.download_prices("MS")
+        calls = len(stooq_responses.calls)
+        second = market_loader.download_prices("MS")
+
+        assert len(stooq_responses.calls) == calls
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_compute_returns_simple(self, market_loader, stooq_responses):
+        """Test simple returns reconcile with the close prices on every row."""
+        df = market_loader.compute_returns(market_loader.download_prices("JPM"))
+        close = df["close"].to_numpy()
+
+        assert np.isnan(df["ret"].iloc[0])
+        np.testing.assert_allclose(df["ret"].to_numpy()[1:], close[1:] / close[:-1] - 1, atol=1e-10)
+
+    def test_compute_returns_log(self, market_loader, stooq_responses):
+        """Test log returns reconcile with the close prices on every row."""
+        prices = market_loader.download_prices("JPM")
+        df = market_loader.compute_returns(prices, method="log")
+        close = df["close"].to_numpy()
+
+        assert np.isnan(df["ret"].iloc[0])
+        np.testing.assert_allclose(df["ret"].to_numpy()[1:], np.diff(np.log(close)), atol=1e-10)
+
+    def test_load_all_tickers(self, jpm_ms_prices):
+        """Test loading multiple tickers with returns."""
+        assert set(jpm_ms_prices["ticker"].unique()) == {"JPM", "MS"}
+        assert "ret" in jpm_ms_prices.columns
+
+    def test_unique_date_ticker_pairs(self, jpm_ms_prices):
+        """Test that each ticker has at most one row per date."""
+        assert not has_duplicates(jpm_ms_prices, ["date", "ticker"])
+
+    def test_to_parquet_schema(self, market_loader, jpm_ms_prices):
+        """Test conversion to parquet schema."""
+        output = market_loader.to_parquet_schema(jpm_ms_prices)
+
+        assert list(output.columns) == ["date", "ticker", "close", "ret"]
+
+        # Dates are plain datetime.date objects, not timestamps
+        assert output["date"].dtype == object
+        assert isinstance(output["date"].iloc[0], datetime.date)
+        assert not isinstance(output["date"].iloc[0], datetime.datetime)
@@ -5,8 +5,10 @@ import pytest
 
 from banklab.clean.xbrl_normalize import (
     BANK_LINE_ITEM_MAPPINGS,
+    NAMESPACES,
     LineItemMapping,
     XBRLNormalizer,
+    _validate_mappings,
 )
 
 
@@ -46,9 +48,25 @@ class TestLineItemMappings:
         """Verify XBRL tags follow expected format."""
         for _name, mapping in BANK_LINE_ITEM_MAPPINGS.items():
             for tag in mapping.tags:
-                assert ":" in tag, f"Tag {tag} should have namespace prefix"
-                namespace, tag_name = tag.split(":", 1)
-                assert namespace in ["us-gaap", "dei", "srt"]
+                namespace, sep, _tag_name = tag.partition(":")
+                assert sep, f"Tag {tag} should have namespace prefix"
+                assert namespace in NAMESPACES
+
+    def test_validate_mappings_rejects_bad_tags(self):
+        """Verify tag validation flags missing prefixes and unknown namespaces."""
+        mapping = LineItemMapping(
+            name="x",
+            display_name="X",
+            category="balance_sheet",
+            tags=["us-gaap:Assets", "Assets", "ifrs-full:Assets"],
+            is_flow=False,
+            expected_sign="positive",
+            unit_filter="USD",
+            description="Test",
+        )
+
+        with pytest.raises(ValueError, match=r"\['Assets', 'ifrs-full:Assets'\]"):
+            _validate_mappings({"x": mapping})
 
 
 class TestXBRLNormalizer:
@@ -56,7 +74,7 @@ class TestXBRLNormalizer:
 
     @pytest.fixture
     def sample_raw_facts(self):
-        """Create sample raw facts for testing."""
+        """Create sample raw facts for testing, Arrow-backed like the SEC loader output."""
         return pd.DataFrame(
             [
                 {
@@ -104,7 +122,7 @@ class TestXBRLNormalizer:
                     "form": "10-Q",
                 },
             ]
-        )
+        ).convert_dtypes(dtype_backend="pyarrow")
 
     def test_normalizer_initialization(self):
         """Test normalizer can be initialized."""
@@ -149,6 +167,7 @@ class TestXBRLNormalizer:
 
         # Should be empty since all data is from 2024
         assert len(result) == 0
+        assert list(result.columns) == list(XBRLNormalizer.OUTPUT_COLUMNS)
 
     def test_to_wide_format(self, sample_raw_facts):
         """Test conversion to wide format."""
@@ -3,7 +3,10 @@
 import pandas as pd
 import pytest
 
+from banklab.ingest import MarketLoader
+from banklab.io import read_parquet
 from banklab.process.pipeline import DataPipeline
+from banklab.quality.checks import has_duplicates
 
 
 class TestDataPipelineIntegration:
@@ -61,6 +64,17 @@ class TestDataPipelineIntegration:
         # Should return None without erroring
         assert result is None
 
+    def test_run_prices_rejects_duplicate_keys(self, test_config, jpm_ms_prices, monkeypatch):
+        """Test that the prices stage refuses to write repeated date-ticker rows."""
+        doubled = pd.concat([jpm_ms_prices, jpm_ms_prices.head(1)], ignore_index=True)
+        monkeypatch.setattr(MarketLoader, "load_all_tickers", lambda self, **kwargs: doubled)
+
+        pipeline = DataPipeline(test_config)
+        with pytest.raises(ValueError, match="duplicate"):
+            pipeline.run_prices()
+
+        assert not (test_config.processed_dir / "prices_daily.parquet").exists()
+
     @pytest.mark.network
     def test_validate_outputs_all_present(self, test_config, mock_fred_api_key):
         """Test output validation when all files present."""
@@ -85,7 +99,7 @@ class TestDataPipelineSchemas:
         """Test that prices output has correct types."""
         pipeline = DataPipeline(test_config)
         output_path = pipeline.run_prices()
-        df = pd.read_parquet(output_path)
+        df = read_parquet(output_path, columns=["ticker", "close", "ret"])
 
         # Check types
         assert df["ticker"].dtype == "object"  # string
@@ -97,18 +111,17 @@ class TestDataPipelineSchemas:
         """Test that prices have unique date-ticker combinations."""
         pipeline = DataPipeline(test_config)
         output_path = pipeline.run_prices()
-        df = pd.read_parquet(output_path)
+        df = read_parquet(output_path, columns=["date", "ticker"])
 
         # No duplicates on date + ticker
-        duplicates = df.duplicated(subset=["date", "ticker"], keep=False)
-        assert not duplicates.any()
+        assert not has_duplicates(df, ["date", "ticker"])
 
     @pytest.mark.network
     def test_factors_unique_dates(self, test_config):
         """Test that factors have unique dates."""
         pipeline = DataPipeline(test_config)
         output_path = pipeline.run_factors()
-        df = pd.read_parquet(output_path)
+        df = read_parquet(output_path, columns=["date"])
 
         assert df["date"].is_unique
 
@@ -117,7 +130,7 @@ class TestDataPipelineSchemas:
         """Test that fundamentals includes both JPM and MS."""
         pipeline = DataPipeline(test_config)
         output_path = pipeline.run_fundamentals()
-        df = pd.read_parquet(output_path)
+        df = read_parquet(output_path, columns=["ticker"])
 
         tickers = df["ticker"].unique()
         assert "JPM" in tickers
@@ -1,6 +1,8 @@
 """Tests for data quality checks."""
 
+import numpy as np
 import pandas as pd
+import pytest
 
 from banklab.quality.checks import (
     QualityReport,
@@ -10,6 +12,7 @@ from banklab.quality.checks import (
     check_completeness,
     check_positive_values,
     check_reasonable_ratios,
+    has_duplicates,
     run_all_checks,
 )
 
@@ -38,6 +41,21 @@ class TestQualityReport:
         assert len(report.warnings) == 1
         assert not report.has_errors()
 
+    def test_warnings_is_read_only(self):
+        """Test that warnings cannot be appended to directly (use add())."""
+        report = QualityReport()
+
+        with pytest.raises(AttributeError):
+            report.warnings.append(
+                QualityWarning(
+                    check_name="test",
+                    severity=Severity.INFO,
+                    ticker="JPM",
+                    period="2024-Q1",
+                    message="Dropped",
+                )
+            )
+
     def test_has_errors(self):
         """Test error detection."""
         report = QualityReport()
@@ -106,6 +124,9 @@ class TestQualityReport:
         assert isinstance(df, pd.DataFrame)
         assert len(df) == 1
         assert "ticker" in df.columns
+        assert isinstance(df["severity"].dtype, pd.CategoricalDtype)
+        assert list(df["severity"].cat.categories) == ["info", "warning", "error"]
+        assert df["severity"].iloc[0] == "warning"
 
 
 class TestBalanceSheetIdentity:
@@ -152,6 +173,26 @@ class TestBalanceSheetIdentity:
         assert len(report.warnings) == 1
         assert "doesn't balance" in report.warnings[0].message
 
+    def test_only_failing_rows_flagged(self):
+        """Test that missing values and zero assets are skipped across many rows."""
+        df = pd.DataFrame(
+            {
+                "ticker": ["JPM", "JPM", "MS", "MS"],
+                "fiscal_year": [2024, 2024, 2024, 2024],
+                "fiscal_period": ["Q1", "Q2", "Q1", "Q2"],
+                "total_assets": [100.0, np.nan, 0.0, 100.0],
+                "total_liabilities": [80.0, 80.0, 80.0, 80.0],
+                "total_equity": [20.0, 10.0, 10.0, 10.0],
+            }
+        )
+
+        report = QualityReport()
+        check_balance_sheet_identity(df, report, tolerance=0.01)
+
+        assert len(report.warnings) == 1
+        assert report.warnings[0].ticker == "MS"
+        assert report.warnings[0].period == "2024-Q2"
+
 
 class TestPositiveValues:
     """Tests for positive value check."""
@@ -303,3 +344,53 @@ class TestRunAllChecks:
         assert "balance_sheet_identity" in report.checks_run
         assert "positive_values" in report.checks_run
         assert "completeness" in report.checks_run
+
+    def test_ratio_checks_use_long_kpis(self):
+        """Test that ratio checks read long-format KPIs when provided."""
+        wide = pd.DataFrame(
+            [
+                {
+                    "ticker": "JPM",
+                    "fiscal_year": 2024,
+                    "fiscal_period": "Q1",
+                    "total_assets": 100,
+                    "total_liabilities": 80,
+                    "total_equity": 20,
+                    "net_income": 5,
+                }
+            ]
+        )
+        kpis = pd.DataFrame(
+            [
+                {
+                    "ticker": "JPM",
+                    "fiscal_year": 2024,
+                    "fiscal_period": "Q1",
+                    "kpi_name": name,
+                    "value": value,
+                }
+                for name, value in [("leverage", 50.0), ("roe", 0.10), ("nim", 0.03)]
+            ]
+        )
+
+        report = run_all_checks(wide, kpis=kpis)
+
+        ratio_warnings = [w for w in report.warnings if w.check_name == "reasonable_ratios"]
+        assert len(ratio_warnings) == 1
+        assert "leverage is unusually high" in ratio_warnings[0].message
+
+
+class TestHasDuplicates:
+    """Tests for the duplicate key helper."""
+
+    def test_detects_duplicate_keys(self):
+        """Test that a repeated (date, ticker) pair is found and unique keys pass."""
+        df = pd.DataFrame(
+            {
+                "date": ["2024-01-02", "2024-01-02", "2024-01-03"],
+                "ticker": ["JPM", "MS", "JPM"],
+            }
+        )
+
+        assert not has_duplicates(df, ["date", "ticker"])
+        assert has_duplicates(df, ["date"])
@@ -1,9 +1,16 @@
 """Tests for SEC EDGAR data loader."""
 
+import orjson
 import pandas as pd
 import pytest
+import responses
 
-from banklab.ingest.sec import SECLoader
+from banklab.ingest.sec import (
+    CATEGORY_COLUMNS,
+    SEC_COMPANY_FACTS_URL,
+    SEC_TICKERS_URL,
+    SECLoader,
+)
 
 
 class TestSECLoader:
@@ -90,6 +97,9 @@ class TestSECLoader:
         # Date should be datetime
         assert pd.api.types.is_datetime64_any_dtype(df["date"])
 
+        # Low-cardinality labels are stored as categoricals
+        assert all(isinstance(df[col].dtype, pd.CategoricalDtype) for col in CATEGORY_COLUMNS)
+
     @pytest.mark.network
     def test_extract_facts_date_monotonicity(self, test_config):
         """Test that extracted facts are sorted by date."""
@@ -144,5 +154,111 @@ class TestSECLoader:
         assert facts1 == facts2
 
         # Cache file should exist
-        cache_files = list(test_config.raw_dir.glob("sec/*.json"))
+        cache_files = list(test_config.raw_dir.glob("sec/*.json*"))
         assert len(cache_files) > 0
+
+
+class TestSECLoaderUnit:
+    """Unit tests that don't require network access."""
+
+    def test_ticker_map_served_from_cache(self, test_config):
+        """Test that a cached ticker map is used and lookups are case-insensitive."""
+        loader = SECLoader(test_config)
+        tickers = {
+            "0": {"cik_str": 19617, "ticker": "JPM", "title": "JPMORGAN CHASE & CO"},
+            "1": {"cik_str": 1067983, "ticker": "brk-b", "title": "BERKSHIRE HATHAWAY INC"},
+        }
+        loader.cache.store(
+            "company_tickers.json", orjson.dumps(tickers), "https://www.sec.gov/files/"
+        )
+
+        assert loader.get_cik("jpm") == "0000019617"
+        assert loader.get_cik("BRK-B") == "0001067983"
+        assert set(loader.get_ticker_cik_map()) == {"JPM", "BRK-B"}
+
+        with pytest.raises(ValueError, match="not found"):
+            loader.get_cik("XYZ")
+
+    def test_get_cik_is_memoized(self, test_config):
+        """Test that repeat CIK lookups are served from the per-instance memo."""
+        loader = SECLoader(test_config)
+        loader.cache.store(
+            "company_tickers.json",
+            orjson.dumps({"0": {"cik_str": 19617, "ticker": "JPM", "title": "JPMORGAN"}}),
+            "https://www.sec.gov/files/",
+        )
+
+        assert loader.get_cik("JPM") == loader.get_cik("JPM")
+        assert loader.get_cik.cache_info().hits == 1
+        assert SECLoader(test_config).get_cik.cache_info().currsize == 0
+
+    def test_load_all_tickers_offline(self, test_config):
+        """Test the prefetch and process-pool path against stubbed SEC responses."""
+        test_config.sec_rate_limit = 0
+        with responses.RequestsMock() as mock:
+            _stub_company_facts(
+                mock,
+                {
+                    19617: _company_facts([10, 20, 30], "10-Q", "USD"),
+                    895421: _company_facts([10, 20, 30], "10-K", "shares"),
+                },
+            )
+            loader = SECLoader(test_config)
+            combined = loader.load_all_tickers(["JPM", "MS"])
+
+        # Single-ticker frames come from the cache the prefetch filled
+        singles = [loader.extract_facts_to_df(ticker) for ticker in ["JPM", "MS"]]
+
+        assert len(combined) == 6
+        assert set(combined["ticker"]) == {"JPM", "MS"}
+        for col in CATEGORY_COLUMNS:
+            assert isinstance(combined[col].dtype, pd.CategoricalDtype)
+            assert set(combined[col].cat.categories) == set().union(
+                *(single[col].cat.categories for single in singles)
+            )
+        for col in ["cik", "tag"]:
+            assert combined[col].dtype == singles[0][col].dtype == pd.StringDtype("pyarrow")
+        pd.testing.assert_frame_equal(
+            combined.astype(dict.fromkeys(CATEGORY_COLUMNS, object)),
+            pd.concat(singles, ignore_index=True).astype(dict.fromkeys(CATEGORY_COLUMNS, object)),
+        )
+
+    def test_load_all_tickers_mixed_value_types(self, test_config):
+        """Test combining an integer-only ticker with one that has fractional values."""
+        test_config.sec_rate_limit = 0
+        with responses.RequestsMock() as mock:
+            _stub_company_facts(
+                mock,
+                {
+                    19617: _company_facts([10, 20, 30], "10-Q", "USD"),
+                    895421: _company_facts([0.5, 1.25, 2.0], "10-Q", "USD/shares"),
+                },
+            )
+            combined = SECLoader(test_config).load_all_tickers(["JPM", "MS"])
+
+        assert pd.api.types.is_float_dtype(combined["value"])
+        assert combined.loc[combined["ticker"] == "JPM", "value"].tolist() == [10.0, 20.0, 30.0]
+        assert combined.loc[combined["ticker"] == "MS", "value"].tolist() == [0.5, 1.25, 2.0]
+
+
+_TICKERS = {
+    "0": {"cik_str": 19617, "ticker": "JPM", "title": "JPMORGAN CHASE & CO"},
+    "1": {"cik_str": 895421, "ticker": "MS", "title": "MORGAN STANLEY"},
+}
+
+
+def _company_facts(values: list, form: str, unit: str) -> dict:
+    """Company facts document with one quarterly us-gaap:Assets observation per value."""
+    observations = [
+        {"end": f"2023-0{q}-28", "val": val, "fp": f"Q{q}", "fy": 2023, "form": form}
+        for q, val in enumerate(values, start=1)
+    ]
+    return {"facts": {"us-gaap": {"Assets": {"units": {unit: observations}}}}}
+
+
+def _stub_company_facts(mock: responses.RequestsMock, facts_by_cik: dict[int, dict]) -> None:
+    """Serve the JPM/MS ticker map and each CIK's company facts."""
+    mock.add(responses.GET, SEC_TICKERS_URL, body=orjson.dumps(_TICKERS))
+    for cik, body in facts_by_cik.items():
+        url = SEC_COMPANY_FACTS_URL.format(cik=f"{cik:010d}")
+        mock.add(responses.GET, url, body=orjson.dumps(body))
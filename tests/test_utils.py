@@ -1,9 +1,15 @@
 """Tests for utility modules."""
 
+import hashlib
+import os
+import time
+
 import pytest
+import requests
+import responses
 import yaml
 
-from banklab.utils.cache import CacheManager, DataManifest
+from banklab.utils.cache import DataManifest
 from banklab.utils.http import PoliteRequester
 
 
@@ -57,6 +63,105 @@ class TestDataManifest:
 
         assert "key1" in data["files"]
 
+    def test_batch_defers_save_until_exit(self, temp_data_dir):
+        """Test that records inside batch() are written to disk once on exit."""
+        manifest_path = temp_data_dir / "manifest.yml"
+        manifest = DataManifest(manifest_path)
+
+        test_file = temp_data_dir / "test.txt"
+        test_file.write_text("hello")
+
+        with manifest.batch():
+            manifest.record("key1", "http://example.com", test_file)
+            manifest.record("key2", "http://example.com", test_file)
+            assert not manifest_path.exists()
+
+        with open(manifest_path) as f:
+            data = yaml.safe_load(f)
+
+        assert set(data["files"]) == {"key1", "key2"}
+
+    def test_manifest_defers_write(self, temp_data_dir):
+        """Test that a with block batches records into a single save on exit."""
+        manifest_path = temp_data_dir / "manifest.yml"
+
+        test_file = temp_data_dir / "test.txt"
+        test_file.write_text("hello")
+
+        with DataManifest(manifest_path) as manifest:
+            manifest.record("key1", "http://example.com", test_file)
+            assert not manifest_path.exists()
+            manifest.record("key2", "http://example.com", test_file)
+            assert not manifest_path.exists()
+
+        with open(manifest_path) as f:
+            data = yaml.safe_load(f)
+
+        assert set(data["files"]) == {"key1", "key2"}
+
+    def test_record_many_parallel(self, temp_data_dir):
+        """Test that record_many hashes many files and saves them in one write."""
+        manifest_path = temp_data_dir / "manifest.yml"
+        manifest = DataManifest(manifest_path)
+        entries = []
+        for i in range(50):
+            path = temp_data_dir / f"file_{i}.txt"
+            path.write_text(f"content {i}")
+            entries.append((f"key{i}", f"http://example.com/{i}", path, ""))
+
+        manifest.record_many(entries)
+
+        with open(manifest_path) as f:
+            data = yaml.safe_load(f)
+
+        assert len(data["files"]) == 50
+        assert data["files"]["key7"]["file_hash"] == DataManifest._compute_hash(entries[7][2])
+
+    def test_nested_deferral_keeps_outer_block_deferred(self, temp_data_dir):
+        """Test that leaving an inner with block does not end the outer batch."""
+        manifest_path = temp_data_dir / "manifest.yml"
+        manifest = DataManifest(manifest_path)
+
+        test_file = temp_data_dir / "test.txt"
+        test_file.write_text("hello")
+
+        with manifest.batch():
+            with manifest:
+                manifest.record("key1", "http://example.com", test_file)
+            with manifest, manifest:
+                manifest.record("key2", "http://example.com", test_file)
+            manifest.record("key3", "http://example.com", test_file)
+            assert not manifest_path.exists()
+
+        with open(manifest_path) as f:
+            data = yaml.safe_load(f)
+
+        assert set(data["files"]) == {"key1", "key2", "key3"}
+
+    def test_loads_legacy_yaml_manifest(self, temp_data_dir):
+        """Test that manifests written as YAML are still readable."""
+        manifest_path = temp_data_dir / "manifest.yml"
+        entry = {"source_url": "http://example.com", "file_hash": "abc", "notes": ""}
+        with open(manifest_path, "w") as f:
+            yaml.safe_dump({"files": {"old_key": entry}}, f)
+
+        manifest = DataManifest(manifest_path)
+
+        assert manifest.get_entry("old_key") == entry
+
+    def test_export_yaml_round_trip(self, temp_data_dir):
+        """Test that the YAML export loads back through the legacy YAML path."""
+        manifest = DataManifest(temp_data_dir / "manifest.yml")
+        test_file = temp_data_dir / "test.txt"
+        test_file.write_text("test content")
+        manifest.record("test_key", "http://example.com/data", test_file, notes="export")
+
+        export_path = manifest.export_yaml(temp_data_dir / "export" / "manifest.yml")
+
+        assert not export_path.read_text().lstrip().startswith("{")
+        reloaded = DataManifest(export_path)
+        assert reloaded.get_entry("test_key") == manifest.get_entry("test_key")
+
     def test_has_entry(self, temp_data_dir):
         """Test has_entry method."""
         manifest_path = temp_data_dir / "manifest.yml"
@@ -70,6 +175,61 @@ class TestDataManifest:
         assert manifest.has_entry("exists")
         assert not manifest.has_entry("does_not_exist")
 
+    def test_record_skips_rehash_of_unchanged_file(self, temp_data_dir, monkeypatch):
+        """Test that re-recording an unchanged file reuses the stored hash."""
+        manifest = DataManifest(temp_data_dir / "manifest.yml")
+
+        test_file = temp_data_dir / "test.txt"
+        test_file.write_text("hello")
+        manifest.record("key1", "http://example.com", test_file)
+        first_hash = manifest.get_entry("key1")["file_hash"]
+
+        # A fresh manifest picks the size/mtime shortcut up from disk
+        reloaded = DataManifest(temp_data_dir / "manifest.yml")
+        calls = []
+        monkeypatch.setattr(
+            DataManifest, "_compute_hash", staticmethod(lambda *a: calls.append(a) or "x")
+        )
+        reloaded.record("key1", "http://example.com", test_file)
+
+        assert calls == []
+        assert reloaded.get_entry("key1")["file_hash"] == first_hash
+
+    def test_record_idempotent_no_rewrite(self, temp_data_dir, monkeypatch):
+        """Test that re-recording an unchanged file keeps its entry and skips the save."""
+        manifest_path = temp_data_dir / "manifest.yml"
+        manifest = DataManifest(manifest_path)
+
+        test_file = temp_data_dir / "test.txt"
+        test_file.write_text("hello")
+        manifest.record("key1", "http://example.com", test_file)
+        first = dict(manifest.get_entry("key1"))
+        mtime = manifest_path.stat().st_mtime_ns
+
+        saves = []
+        monkeypatch.setattr(DataManifest, "_save", lambda self: saves.append(self))
+        manifest.record("key1", "http://example.com", test_file)
+
+        assert saves == []
+        assert manifest.get_entry("key1") == first
+        assert manifest_path.stat().st_mtime_ns == mtime
+
+        # A changed source still updates the entry
+        manifest.record("key1", "http://example.org", test_file)
+        assert len(saves) == 1
+
+    def test_record_missing_file(self, temp_data_dir):
+        """Test that a missing file is recorded the same way with or without a known hash."""
+        manifest = DataManifest(temp_data_dir / "manifest.yml")
+        missing = temp_data_dir / "missing.txt"
+
+        manifest.record("hashed", "http://example.com", missing)
+        manifest.record("given", "http://example.com", missing, file_hash="abc")
+
+        assert manifest.get_entry("hashed")["file_hash"] == "N/A"
+        assert manifest.get_entry("given")["file_hash"] == "abc"
+        assert "file_size" not in manifest.get_entry("given")
+
     def test_compute_hash_deterministic(self, temp_data_dir):
         """Test that file hash is deterministic."""
         test_file = temp_data_dir / "test.txt"
@@ -81,35 +241,124 @@ class TestDataManifest:
         assert hash1 == hash2
         assert len(hash1) == 64  # SHA256 hex digest
 
+    def test_record_with_blake2b(self, temp_data_dir):
+        """Test that a manifest can hash with blake2b and only reuses matching hashes."""
+        test_file = temp_data_dir / "test.txt"
+        test_file.write_bytes(b"hello")
+        DataManifest(temp_data_dir / "manifest.yml").record("key1", "http://example.com", test_file)
+
+        manifest = DataManifest(temp_data_dir / "manifest.yml", hash_algo="blake2b")
+        manifest.record("key1", "http://example.com", test_file)
+
+        entry = manifest.get_entry("key1")
+        assert entry["hash_algo"] == "blake2b"
+        assert entry["file_hash"] == hashlib.blake2b(b"hello").hexdigest()
+        assert DataManifest._compute_hash(test_file, "blake2b") == entry["file_hash"]
+
 
 class TestCacheManager:
     """Tests for CacheManager functionality."""
 
-    def test_store_and_load_text(self, temp_data_dir):
+    def test_store_and_load_text(self, manifest_and_cache):
         """Test storing and loading text content."""
-        manifest = DataManifest(temp_data_dir / "manifest.yml")
-        cache = CacheManager(temp_data_dir / "cache", manifest)
+        _, cache = manifest_and_cache
 
         cache.store("test.txt", "hello world", "http://example.com")
 
         loaded = cache.load_text("test.txt")
         assert loaded == "hello world"
 
-    def test_store_and_load_bytes(self, temp_data_dir):
+    def test_store_and_load_bytes(self, manifest_and_cache):
         """Test storing and loading binary content."""
-        manifest = DataManifest(temp_data_dir / "manifest.yml")
-        cache = CacheManager(temp_data_dir / "cache", manifest)
+        manifest, cache = manifest_and_cache
 
         binary_data = b"\x00\x01\x02\x03"
         cache.store("test.bin", binary_data, "http://example.com")
 
         loaded = cache.load_bytes("test.bin")
         assert loaded == binary_data
+        assert (
+            manifest.get_entry("test.bin")["file_hash"] == hashlib.sha256(binary_data).hexdigest()
+        )
 
-    def test_has_cached(self, temp_data_dir):
+    def test_load_mmap(self, manifest_and_cache):
+        """Test zero-copy loads of plain and compressed entries."""
+        _, cache = manifest_and_cache
+        big = b"x" * 100_000
+
+        cache.store("test.bin", b"\x00\x01\x02\x03", "http://example.com")
+        cache.store("big.bin", big, "http://example.com")
+
+        view = cache.load_mmap("test.bin")
+        assert len(view) == 4
+        assert view.readonly
+        assert bytes(view) == b"\x00\x01\x02\x03"
+        assert cache.load_mmap("big.bin") == big
+        assert cache.load_mmap("missing.bin") is None
+
+    def test_mmap_view_survives_restore(self, manifest_and_cache):
+        """Test that re-storing a key does not truncate a file still mapped by a view."""
+        _, cache = manifest_and_cache
+        cache.store("test.bin", b"a" * 8192, "http://example.com")
+        view = cache.load_mmap("test.bin")
+
+        cache.store("test.bin", b"b", "http://example.com")
+
+        assert bytes(view[-4:]) == b"aaaa"
+        assert cache.load_bytes("test.bin") == b"b"
+        assert [p.name for p in cache.cache_dir.iterdir()] == ["test.bin"]
+
+    @pytest.mark.parametrize("mmap_threshold", [1 << 20, 1])
+    def test_store_and_load_json(self, manifest_and_cache, monkeypatch, mmap_threshold):
+        """Test loading cached JSON from both the read and memory-map paths."""
+        monkeypatch.setattr("banklab.utils.cache._MMAP_THRESHOLD", mmap_threshold)
+        _, cache = manifest_and_cache
+
+        cache.store("facts.json", '{"facts": {"us-gaap": [1, 2]}}', "http://example.com")
+
+        assert cache.load_json("facts.json") == {"facts": {"us-gaap": [1, 2]}}
+        assert cache.load_json("missing.json") is None
+
+    def test_large_payload_stored_compressed(self, manifest_and_cache):
+        """Test that large payloads are zstd-compressed and load transparently."""
+        manifest, cache = manifest_and_cache
+        content = b'{"values": [' + b"1, " * 50_000 + b"1]}"
+
+        path = cache.store("big.json", content, "http://example.com")
+
+        assert path.name == "big.json.zst"
+        assert path.stat().st_size < len(content)
+        assert cache.has_cached("big.json")
+        assert cache.load_bytes("big.json") == content
+        assert len(cache.load_json("big.json")["values"]) == 50_001
+        # The manifest hash describes the file on disk, so it survives re-recording
+        file_hash = manifest.get_entry("big.json")["file_hash"]
+        assert file_hash == DataManifest._compute_hash(path)
+        assert file_hash != hashlib.sha256(content).hexdigest()
+        manifest._hash_cache.clear()
+        manifest.record("big.json", "http://example.com", path)
+        assert manifest.get_entry("big.json")["file_hash"] == file_hash
+
+    def test_store_many(self, manifest_and_cache):
+        """Test storing several files with a single manifest update."""
+        manifest, cache = manifest_and_cache
+
+        paths = cache.store_many(
+            [
+                ("a.txt", "alpha", "http://example.com/a", ""),
+                ("b.bin", b"\x00\x01", "http://example.com/b", "binary"),
+            ]
+        )
+
+        assert [p.name for p in paths] == ["a.txt", "b.bin"]
+        assert cache.load_text("a.txt") == "alpha"
+        assert cache.load_bytes("b.bin") == b"\x00\x01"
+        assert manifest.get_entry("a.txt")["file_hash"] == DataManifest._compute_hash(paths[0])
+        assert manifest.get_entry("b.bin")["notes"] == "binary"
+
+    def test_has_cached(self, manifest_and_cache):
         """Test checking if file is cached."""
-        manifest = DataManifest(temp_data_dir / "manifest.yml")
-        cache = CacheManager(temp_data_dir / "cache", manifest)
+        _, cache = manifest_and_cache
 
         assert not cache.has_cached("test.txt")
 
@@ -117,10 +366,42 @@ class TestCacheManager:
 
         assert cache.has_cached("test.txt")
 
-    def test_cache_key_sanitization(self, temp_data_dir):
+    def test_has_many_cached(self, manifest_and_cache, monkeypatch):
+        """Test that bulk lookups scan the cache directory once."""
+        _, cache = manifest_and_cache
+        cache.store("key_3", "small", "http://example.com")
+        cache.store("key_7", "x" * 100_000, "http://example.com")  # Stored as .zst
+
+        scans = []
+        scandir = os.scandir
+        monkeypatch.setattr(
+            "banklab.utils.cache.os.scandir", lambda path: scans.append(path) or scandir(path)
+        )
+        result = cache.has_many_cached([f"key_{i}" for i in range(100)])
+
+        assert len(scans) == 1
+        assert {key for key, cached in result.items() if cached} == {"key_3", "key_7"}
+        assert len(result) == 100
+
+    def test_restore_same_content_skips_manifest_save(self, manifest_and_cache, monkeypatch):
+        """Test that storing identical bytes again does not rewrite the manifest."""
+        manifest, cache = manifest_and_cache
+        cache.store("test.txt", "hello", "http://example.com")
+        first = dict(manifest.get_entry("test.txt"))
+
+        saves = []
+        monkeypatch.setattr(DataManifest, "_save", lambda self: saves.append(self))
+        cache.store("test.txt", "hello", "http://example.com")
+
+        assert saves == []
+        assert manifest.get_entry("test.txt")["download_timestamp"] == first["download_timestamp"]
+
+        cache.store("test.txt", "changed", "http://example.com")
+        assert len(saves) == 1
+
+    def test_cache_key_sanitization(self, manifest_and_cache):
         """Test that cache keys with special chars are sanitized."""
-        manifest = DataManifest(temp_data_dir / "manifest.yml")
-        cache = CacheManager(temp_data_dir / "cache", manifest)
+        _, cache = manifest_and_cache
 
         # Key with special characters
         key = "http://example.com/path?param=value"
@@ -134,10 +415,23 @@ class TestCacheManager:
         assert "/" not in cache_path.name
         assert "?" not in cache_path.name
 
-    def test_load_nonexistent_returns_none(self, temp_data_dir):
+    def test_long_cache_keys_are_shortened(self, manifest_and_cache):
+        """Test that over-long keys map to distinct, bounded filenames."""
+        _, cache = manifest_and_cache
+
+        key_a = "https://example.com/" + "a" * 300 + "?page=1"
+        key_b = "https://example.com/" + "a" * 300 + "?page=2"
+        cache.store(key_a, "first", "http://example.com")
+        cache.store(key_b, "second", "http://example.com")
+
+        assert len(cache.get_cache_path(key_a).name) < 255
+        assert cache.get_cache_path(key_a) != cache.get_cache_path(key_b)
+        assert cache.load_text(key_a) == "first"
+        assert cache.load_text(key_b) == "second"
+
+    def test_load_nonexistent_returns_none(self, manifest_and_cache):
         """Test that loading nonexistent file returns None."""
-        manifest = DataManifest(temp_data_dir / "manifest.yml")
-        cache = CacheManager(temp_data_dir / "cache", manifest)
+        _, cache = manifest_and_cache
 
         assert cache.load_text("does_not_exist") is None
         assert cache.load_bytes("does_not_exist") is None
@@ -146,20 +440,114 @@ class TestCacheManager:
 class TestPoliteRequester:
     """Tests for PoliteRequester functionality."""
 
-    def test_user_agent_header_set(self):
+    def test_user_agent_header_set(self, requester):
         """Test that User-Agent header is set."""
-        requester = PoliteRequester(user_agent="Test Agent")
-
         assert requester.session.headers["User-Agent"] == "Test Agent"
 
-    def test_default_headers_set(self):
+    def test_default_headers_set(self, requester):
         """Test that default headers are properly configured."""
-        requester = PoliteRequester(user_agent="Test Agent")
-
         headers = requester.session.headers
         assert "Accept" in headers
         assert "Accept-Encoding" in headers
 
+    def test_rate_limit_spaces_requests(self, monkeypatch):
+        """Test that the token bucket sleeps once the burst is used up."""
+        requester = PoliteRequester(user_agent="Test Agent", rate_limit=0.5)
+        sleeps = []
+        monkeypatch.setattr("banklab.utils.http.time.sleep", sleeps.append)
+
+        requester._wait_for_rate_limit()
+        requester._wait_for_rate_limit()
+
+        assert len(sleeps) == 1
+        assert 0.4 < sleeps[0] <= 0.5
+
+    @responses.activate
+    def test_get_json_stubbed(self):
+        """Test JSON request against a stubbed endpoint."""
+        responses.add(responses.GET, "https://httpbin.org/json", json={"x": 1})
+        requester = PoliteRequester(user_agent="BankLab Tests")
+
+        assert requester.get_json("https://httpbin.org/json") == {"x": 1}
+        assert responses.calls[0].request.headers["User-Agent"] == "BankLab Tests"
+
+    @responses.activate
+    def test_get_text_stubbed(self):
+        """Test text request against a stubbed endpoint."""
+        responses.add(responses.GET, "https://httpbin.org/robots.txt", body="User-agent: *\n")
+        requester = PoliteRequester(user_agent="BankLab Tests")
+
+        assert requester.get_text("https://httpbin.org/robots.txt") == "User-agent: *\n"
+
+    @responses.activate
+    def test_get_many_preserves_order(self):
+        """Test that concurrent responses come back in input order."""
+
+        def slow_first(request):
+            if request.url.endswith("/0"):
+                time.sleep(0.05)
+            return 200, {}, request.url[-1]
+
+        for i in range(3):
+            responses.add_callback(responses.GET, f"https://example.com/{i}", slow_first)
+        requester = PoliteRequester(user_agent="BankLab Tests", rate_limit=0)
+
+        result = requester.get_many([f"https://example.com/{i}" for i in range(3)])
+
+        assert [r.text for r in result] == ["0", "1", "2"]
+
+    @responses.activate
+    def test_get_many_propagates_errors(self):
+        """Test that a failed request among many raises."""
+        responses.add(responses.GET, "https://example.com/ok", body="ok")
+        responses.add(responses.GET, "https://example.com/missing", status=404)
+        requester = PoliteRequester(user_agent="BankLab Tests", rate_limit=0)
+
+        with pytest.raises(requests.HTTPError):
+            requester.get_many(["https://example.com/ok", "https://example.com/missing"])
+
+    @responses.activate
+    def test_get_to_file(self, temp_data_dir):
+        """Test that a streamed download lands at the path with its digest returned."""
+        body = b"x" * 1000
+        responses.add(responses.GET, "https://example.com/data.zip", body=body)
+        requester = PoliteRequester(user_agent="BankLab Tests", rate_limit=0)
+        path = temp_data_dir / "data.zip"
+
+        digest = requester.get_to_file("https://example.com/data.zip", path, chunk_size=64)
+
+        assert path.read_bytes() == body
+        assert digest == hashlib.sha256(body).hexdigest()
+        assert list(temp_data_dir.iterdir()) == [path]
+
+    @responses.activate
+    def test_get_to_file_error_leaves_no_partial(self, temp_data_dir):
+        """Test that a failed download raises and removes its partial file."""
+        responses.add(responses.GET, "https://example.com/data.zip", status=404)
+        requester = PoliteRequester(user_agent="BankLab Tests", rate_limit=0)
+
+        with pytest.raises(requests.HTTPError):
+            requester.get_to_file("https://example.com/data.zip", temp_data_dir / "data.zip")
+
+        assert list(temp_data_dir.iterdir()) == []
+
+    @responses.activate
+    def test_get_to_file_stream_error_leaves_no_partial(self, temp_data_dir, monkeypatch):
+        """Test that a read failing mid-stream removes the partially written file."""
+        responses.add(responses.GET, "https://example.com/data.zip", body=b"x" * 1000)
+        requester = PoliteRequester(user_agent="BankLab Tests", rate_limit=0)
+
+        def broken_stream(self, chunk_size=1):
+            yield b"x" * 10
+            raise requests.ConnectionError("connection reset")
+
+        monkeypatch.setattr(requests.Response, "iter_content", broken_stream)
+
+        with pytest.raises(requests.ConnectionError):
+            requester.get_to_file("https://example.com/data.zip", temp_data_dir / "data.zip")
+
+        assert list(temp_data_dir.iterdir()) == []
+
     @pytest.mark.network
     def test_get_json_success(self):
         """Test successful JSON request."""